@@ -9,21 +9,21 @@
 
 import os
 import sys
+import time
 import argparse
-from datetime import datetime
-import pytz  # 添加pytz库导入
 import logging  # 添加logging模块导入
 
 # 将src目录添加到模块搜索路径
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
 
-# 现在可以导入我们的模块
-from src.main import process_news
-from src.crawler.article_fetcher import fetch_first_article
-from src.converter.article_formatter import process_articles
-from src.article_main import process_article
-from src.summarize import run_summarize
-from src.summarize.file_finder import FileFinder
+# 业务模块在各子命令分支中按需导入，避免 version/--help 加载lxml、requests等重量级依赖
+
+# 北京时间固定为UTC+8且无夏令时，直接按偏移量计算，无需时区库
+CN_UTC_OFFSET = 8 * 3600
+
+def now_cn():
+    """返回当前北京时间字符串，格式: YYYY-mm-dd HH:MM:SS"""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(time.time() + CN_UTC_OFFSET))
 
 def parse_args():
     """解析命令行参数"""
@@ -50,6 +50,10 @@ def parse_args():
     summarize_parser.add_argument('api_key', nargs='?', help='DeepSeek API密钥，如未提供则使用DEEPSEEK_API_KEY环境变量')
     summarize_parser.add_argument('-o', '--output_dir', help='输出目录路径')
     summarize_parser.add_argument('-m', '--mock', action='store_true', help='使用模拟模式，不调用实际API')
+    summarize_parser.add_argument('-a', '--all', action='store_true', help='并发总结所有匹配的文件，而不是随机选择一个')
+    summarize_parser.add_argument('-c', '--concurrency', type=int, default=8, help='总结所有文件时同时进行的最大API调用数')
+    summarize_parser.add_argument('--no-cache', dest='use_cache', action='store_false', help='不使用总结结果缓存（默认位于~/.cache/news-aggregator/summary），总是调用API')
+    summarize_parser.add_argument('--cache-dir', help='总结结果缓存目录，默认使用NEWS_SUMMARY_CACHE_DIR环境变量或~/.cache/news-aggregator/summary')
     summarize_parser.add_argument('-v', '--verbose', action='store_true', help='输出详细日志')
     
     # 文件查找命令
@@ -67,8 +71,11 @@ def main():
     args = parse_args()
     
     if args.command == 'crawl':
+        from src.main import process_news
+        from src.crawler.article_fetcher import fetch_first_article
+        
         # 使用中国时间作为日志记录
-        china_time = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+        china_time = now_cn()
         print(f"[{china_time}] 开始爬取人民日报新闻...")
         
         success = True
@@ -78,7 +85,7 @@ def main():
             success = process_news(date=args.date, output_dir=args.output_dir)
         
         # 无论上一步是否成功，都尝试爬取文章详情
-        china_time = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+        china_time = now_cn()
         print(f"[{china_time}] 开始爬取第一版面指定新闻的详细内容...")
         
         # 爬取文章
@@ -91,14 +98,16 @@ def main():
             success = False
         
         # 结束时间
-        china_time = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+        china_time = now_cn()
         print(f"[{china_time}] 爬取任务{'成功' if success else '失败'}")
         
         return 0 if success else 1
     
     elif args.command == 'get-article':
+        from src.article_main import process_article
+        
         # 使用中国时间作为日志记录
-        china_time = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+        china_time = now_cn()
         print(f"[{china_time}] 开始爬取并处理单篇文章...")
         
         # 调用article_main.py中的process_article函数
@@ -109,14 +118,16 @@ def main():
         )
         
         # 结束时间
-        china_time = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+        china_time = now_cn()
         print(f"[{china_time}] 文章处理任务{'成功' if success else '失败'}")
         
         return 0 if success else 1
     
     elif args.command == 'ai-summarize':
+        from src.summarize import run_summarize
+        
         # 使用中国时间作为日志记录
-        china_time = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+        china_time = now_cn()
         print(f"[{china_time}] 开始进行文章AI总结...")
         
         # 设置日志级别
@@ -127,18 +138,24 @@ def main():
         success = run_summarize(
             api_key=args.api_key,
             output_dir=args.output_dir,
-            use_mock=args.mock if hasattr(args, 'mock') else False
+            use_mock=args.mock if hasattr(args, 'mock') else False,
+            summarize_all=args.all,
+            max_concurrency=args.concurrency,
+            use_cache=args.use_cache,
+            cache_dir=args.cache_dir
         )
         
         # 结束时间
-        china_time = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+        china_time = now_cn()
         print(f"[{china_time}] AI总结任务{'成功' if success else '失败'}")
         
         return 0 if success else 1
     
     elif args.command == 'find-files':
+        from src.summarize.file_finder import FileFinder
+        
         # 使用中国时间作为日志记录
-        china_time = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+        china_time = now_cn()
         print(f"[{china_time}] 开始查找新闻文件...")
         
         # 设置日志级别
@@ -168,14 +185,14 @@ def main():
             print(f"昨天日期: {finder.get_yesterday_date()}")
             
             # 结束时间
-            china_time = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+            china_time = now_cn()
             print(f"[{china_time}] 文件查找任务成功")
             
             return 0
         except Exception as e:
             print(f"错误: {str(e)}")
             # 结束时间
-            china_time = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+            china_time = now_cn()
             print(f"[{china_time}] 文件查找任务失败")
             return 1
         
@@ -6,7 +6,7 @@ import sys
 import logging
 import argparse
 from datetime import datetime
-import pytz  # 添加pytz库导入
+from zoneinfo import ZoneInfo
 
 # 导入自定义模块
 from crawler.article_main import crawl_article
@@ -21,6 +21,9 @@ logging.basicConfig(
     ]
 )
 
+# 北京时区，模块加载时解析一次
+SHANGHAI_TZ = ZoneInfo('Asia/Shanghai')
+
 logger = logging.getLogger("ArticleAggregatorMain")
 
 def process_article(date=None, output_dir=None, format_type="markdown"):
@@ -40,7 +43,7 @@ def process_article(date=None, output_dir=None, format_type="markdown"):
         os.makedirs(output_dir, exist_ok=True)
     
     # 使用北京时间
-    china_time = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+    china_time = datetime.now(SHANGHAI_TZ).strftime('%Y-%m-%d %H:%M:%S')
     logger.info(f"开始处理文章数据流程 (北京时间: {china_time})")
     
     # 1. 爬取文章
@@ -63,7 +66,7 @@ def process_article(date=None, output_dir=None, format_type="markdown"):
     convert_result = convert_article(html_path, output_dir, format_type)
     
     # 完成时使用北京时间
-    china_time = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+    china_time = datetime.now(SHANGHAI_TZ).strftime('%Y-%m-%d %H:%M:%S')
     
     if convert_result['success']:
         logger.info(f"文章处理成功完成 (北京时间: {china_time})")
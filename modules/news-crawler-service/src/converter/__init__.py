@@ -9,5 +9,19 @@
 
 __version__ = '0.2.0'
 
-from .formatter import MarkdownFormatter
-from .article_formatter import ArticleFormatter, process_articles 
\ No newline at end of file
+# 公开对象与所在子模块的对应关系，首次访问时才导入
+_LAZY_EXPORTS = {
+    'MarkdownFormatter': '.formatter',
+    'ArticleFormatter': '.article_formatter',
+    'process_articles': '.article_formatter',
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+def __getattr__(name):
+    """按需导入子模块中的公开对象，仅读取版本号时不加载lxml等依赖"""
+    if name in _LAZY_EXPORTS:
+        import importlib
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}") 
\ No newline at end of file
@@ -2,15 +2,269 @@
 # -*- coding: utf-8 -*-
 
 import os
+import io
 import re
+import time
 import logging
 import json
+import tarfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-import pytz
-from bs4 import BeautifulSoup
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+from lxml import etree
+from lxml import html as lxml_html
+
+# 优先使用orjson生成JSON（更快），未安装时回退到标准库json
+try:
+    import orjson
+    has_orjson = True
+except ImportError:
+    has_orjson = False
 
 logger = logging.getLogger("ArticleFormatter")
 
+# 配置日志记录器（模块导入时执行一次）
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+# 北京时区，模块加载时解析一次
+_SHANGHAI_TZ = ZoneInfo('Asia/Shanghai')
+
+def _now_str():
+    """返回当前北京时间字符串，格式: YYYY-mm-dd HH:MM:SS"""
+    return datetime.now(_SHANGHAI_TZ).strftime('%Y-%m-%d %H:%M:%S')
+
+# 各输出格式对应的文件扩展名
+_OUTPUT_EXTENSIONS = {
+    'markdown': ('.md',),
+    'json': ('.json',),
+    'all': ('.md', '.json'),
+}
+
+# 使用进程池并行转换的最少文件数：每日几十篇小文件时，进程启动和序列化的开销超过并行收益，直接串行处理
+PROCESS_POOL_MIN_FILES = 200
+
+# 汇总输出模式下的归档文件名和索引文件名
+AGGREGATE_ARCHIVE = "articles.tar"
+AGGREGATE_INDEX = "index.json"
+
+# 文章HTML中需要提取的区块class，对应 .title / .meta span / .content / .source-link a
+_TARGET_CLASSES = ('title', 'meta', 'content', 'source-link')
+
+# 预编译的正则表达式
+_WHITESPACE_RE = re.compile(r'\s+')
+# 文章HTML文件名，形如 20250511-0101.html (日期-版面号文章序号)
+_ARTICLE_FILE_RE = re.compile(r'(\d{8})-(\d{2})(\d{2})\.html')
+
+def _normalize_whitespace(text):
+    """将连续空白字符折叠为单个空格并去除首尾空白"""
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+def _output_base_name(html_file):
+    """返回文章HTML文件不含目录和扩展名的文件名，用于生成输出文件名
+    
+    目录扫描只收录匹配 _ARTICLE_FILE_RE 的文件，必然带有扩展名，直接按最后一个点切分
+    """
+    return os.path.basename(html_file).rpartition('.')[0]
+
+# 提取时缓存的纯文本长度上限，足够覆盖默认摘要长度
+_PLAIN_TEXT_LIMIT = 1000
+
+# 元数据span的前缀与对应字段（版面号/文章序号在同一个span中，单独处理）
+_META_PREFIXES = (
+    ("作者:", 'author'),
+    ("日期:", 'date'),
+    ("版面:", 'version'),
+)
+
+# 不计入纯文本的标签（与BeautifulSoup的get_text行为一致）
+_NON_TEXT_TAGS = frozenset(('script', 'style', 'template'))
+
+def _collect_text(element, pieces):
+    """递归收集元素及其子孙的文本片段（跳过注释和脚本/样式内容）"""
+    if isinstance(element.tag, str) and element.tag not in _NON_TEXT_TAGS:
+        if element.text:
+            pieces.append(element.text.strip())
+        for child in element:
+            _collect_text(child, pieces)
+            if child.tail:
+                pieces.append(child.tail.strip())
+
+def _element_text(element):
+    """提取元素的纯文本，行为与BeautifulSoup的get_text(strip=True)一致"""
+    pieces = []
+    _collect_text(element, pieces)
+    return "".join(pieces)
+
+def _iter_text(element):
+    """按文档顺序惰性产出元素的文本片段（已去除首尾空白），规则同 _collect_text"""
+    if isinstance(element.tag, str) and element.tag not in _NON_TEXT_TAGS:
+        if element.text:
+            yield element.text.strip()
+        for child in element:
+            yield from _iter_text(child)
+            if child.tail:
+                yield child.tail.strip()
+
+def _text_prefix(element, limit):
+    """提取元素规范化后的纯文本前缀，超过limit个字符即停止遍历
+    
+    Args:
+        element: lxml元素
+        limit (int): 需要的字符数
+        
+    Returns:
+        tuple: (规范化文本, 是否被截断)；被截断时文本长度为limit+1，足以判断是否需要省略号
+    """
+    pieces = []
+    raw_length = 0
+    for piece in _iter_text(element):
+        pieces.append(piece)
+        raw_length += len(piece)
+        # 规范化只会缩短文本，原始长度未超过limit时无需检查
+        if raw_length > limit:
+            text = _normalize_whitespace("".join(pieces))
+            if len(text) > limit:
+                return text[:limit + 1], True
+    return _normalize_whitespace("".join(pieces)), False
+
+def _paragraph_texts(element):
+    """提取元素内所有段落(p)的非空纯文本"""
+    return [text for text in (_element_text(p) for p in element.iter('p')) if text]
+
+def _parse_content_html(content_html):
+    """将文章正文HTML片段解析为元素，用于未缓存段落/纯文本的文章信息"""
+    return lxml_html.fragment_fromstring(content_html or "", create_parent='div')
+
+def _parse_article_file(html_file_path):
+    """解析文章HTML文件并提取文章信息
+    
+    Args:
+        html_file_path (str): HTML文件路径
+        
+    Returns:
+        dict: 文章信息字典，失败时返回None
+    """
+    try:
+        title = "无标题"
+        meta_texts = []
+        content = ""
+        paragraphs = []
+        plain_text = ""
+        plain_text_truncated = False
+        original_url = ""
+        
+        # 增量解析：只保留尚未处理完的目标区块，其余元素解析结束即释放
+        open_counts = dict.fromkeys(_TARGET_CLASSES, 0)
+        title_elem = None
+        content_elem = None
+        title_found = False
+        content_found = False
+        link_found = False
+        
+        for event, elem in etree.iterparse(html_file_path, events=('start', 'end'), html=True, encoding='utf-8'):
+            classes = [c for c in (elem.get('class') or '').split() if c in open_counts]
+            
+            if event == 'start':
+                for c in classes:
+                    open_counts[c] += 1
+                if 'title' in classes and not title_found and title_elem is None:
+                    title_elem = elem
+                if 'content' in classes and not content_found and content_elem is None:
+                    content_elem = elem
+                if elem.tag == 'a' and open_counts['source-link'] and not link_found:
+                    original_url = elem.get('href') or ""
+                    link_found = True
+                continue
+            
+            for c in classes:
+                open_counts[c] -= 1
+            
+            if elem is title_elem:
+                title = _element_text(elem)
+                title_elem = None
+                title_found = True
+            if elem is content_elem:
+                content = lxml_html.tostring(elem, encoding='unicode', with_tail=False)
+                # 顺带提取段落和纯文本，供生成Markdown和摘要时直接使用，无需重新解析content
+                paragraphs = _paragraph_texts(elem)
+                plain_text, plain_text_truncated = _text_prefix(elem, _PLAIN_TEXT_LIMIT)
+                content_elem = None
+                content_found = True
+            if 'meta' in classes and open_counts['meta'] == 0:
+                meta_texts.extend(_element_text(span) for span in elem.iter('span'))
+            
+            if not any(open_counts.values()):
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+        
+        # 提取元数据
+        meta_info = {
+            'author': "未知",
+            'date': "",
+            'version': "",
+            'version_number': "",
+            'article_number': ""
+        }
+        
+        for text in meta_texts:
+            for prefix, key in _META_PREFIXES:
+                if text.startswith(prefix):
+                    meta_info[key] = text[len(prefix):].strip()
+                    break
+            else:
+                if text.startswith("版面号:") and "文章序号:" in text:
+                    parts = text.split("，")
+                    if len(parts) == 2:
+                        meta_info['version_number'] = parts[0].replace("版面号:", "").strip()
+                        meta_info['article_number'] = parts[1].replace("文章序号:", "").strip()
+        
+        # 提取文件名中的日期和编号信息
+        file_info = os.path.basename(html_file_path)
+        date_match = _ARTICLE_FILE_RE.match(file_info)
+        file_date = ""
+        file_version = ""
+        file_article = ""
+        
+        if date_match:
+            file_date = date_match.group(1)
+            file_version = date_match.group(2)
+            file_article = date_match.group(3)
+        
+        # 组合文章信息
+        article_info = {
+            'title': title,
+            'author': meta_info['author'],
+            'date': meta_info['date'],
+            'version': meta_info['version'],
+            'version_number': meta_info['version_number'] or file_version,
+            'article_number': meta_info['article_number'] or file_article,
+            'content': content,
+            '_paragraphs': paragraphs,
+            '_plain_text': plain_text,
+            '_plain_text_truncated': plain_text_truncated,
+            'original_url': original_url,
+            'file_date': file_date,
+            'file_path': html_file_path
+        }
+        
+        logger.debug("成功提取文章信息: %s", title)
+        return article_info
+        
+    except Exception as e:
+        logger.error(f"提取文章信息时出错: {str(e)}")
+        return None
+
+@lru_cache(maxsize=128)
+def _load_article_info(html_file_path, mtime_ns, size):
+    """按 (文件路径, 修改时间, 文件大小) 缓存文章解析结果，文件被修改后缓存自动失效"""
+    return _parse_article_file(html_file_path)
+
 class ArticleFormatter:
     """文章格式化与内容处理
     
@@ -18,16 +272,6 @@ class ArticleFormatter:
     提供格式化、增强内容展示和内容转换功能
     """
     
-    def __init__(self):
-        """初始化格式化器"""
-        # 配置日志记录器
-        if not logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            handler.setFormatter(formatter)
-            logger.addHandler(handler)
-            logger.setLevel(logging.INFO)
-    
     def extract_article_info(self, html_file_path):
         """从HTML文件中提取文章信息
         
@@ -37,99 +281,27 @@ class ArticleFormatter:
         Returns:
             dict: 文章信息字典
         """
-        logger.info(f"从HTML文件提取文章信息: {html_file_path}")
+        logger.debug("从HTML文件提取文章信息: %s", html_file_path)
         
-        if not os.path.exists(html_file_path):
+        try:
+            stat = os.stat(html_file_path)
+        except FileNotFoundError:
             logger.error(f"文件不存在: {html_file_path}")
             return None
-        
-        try:
-            with open(html_file_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            # 使用BeautifulSoup解析HTML
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # 提取标题
-            title = "无标题"
-            title_elem = soup.select_one('.title')
-            if title_elem:
-                title = title_elem.get_text(strip=True)
-            
-            # 提取元数据
-            meta_info = {
-                'author': "未知",
-                'date': "",
-                'version': "",
-                'version_number': "",
-                'article_number': ""
-            }
-            
-            meta_elems = soup.select('.meta span')
-            for elem in meta_elems:
-                text = elem.get_text(strip=True)
-                if "作者:" in text:
-                    meta_info['author'] = text.replace("作者:", "").strip()
-                elif "日期:" in text:
-                    meta_info['date'] = text.replace("日期:", "").strip()
-                elif "版面:" in text:
-                    meta_info['version'] = text.replace("版面:", "").strip()
-                elif "版面号:" in text and "文章序号:" in text:
-                    parts = text.split("，")
-                    if len(parts) == 2:
-                        meta_info['version_number'] = parts[0].replace("版面号:", "").strip()
-                        meta_info['article_number'] = parts[1].replace("文章序号:", "").strip()
-            
-            # 提取内容
-            content = ""
-            content_elem = soup.select_one('.content')
-            if content_elem:
-                content = str(content_elem)
-            
-            # 提取原文链接
-            original_url = ""
-            link_elem = soup.select_one('.source-link a')
-            if link_elem and link_elem.has_attr('href'):
-                original_url = link_elem['href']
-            
-            # 提取文件名中的日期和编号信息
-            file_info = os.path.basename(html_file_path)
-            date_match = re.match(r'(\d{8})-(\d{2})(\d{2})\.html', file_info)
-            file_date = ""
-            file_version = ""
-            file_article = ""
-            
-            if date_match:
-                file_date = date_match.group(1)
-                file_version = date_match.group(2)
-                file_article = date_match.group(3)
-            
-            # 组合文章信息
-            article_info = {
-                'title': title,
-                'author': meta_info['author'],
-                'date': meta_info['date'],
-                'version': meta_info['version'],
-                'version_number': meta_info['version_number'] or file_version,
-                'article_number': meta_info['article_number'] or file_article,
-                'content': content,
-                'original_url': original_url,
-                'file_date': file_date,
-                'file_path': html_file_path
-            }
-            
-            logger.info(f"成功提取文章信息: {title}")
-            return article_info
-            
-        except Exception as e:
-            logger.error(f"提取文章信息时出错: {str(e)}")
+        except OSError as e:
+            logger.error(f"读取文件信息失败: {str(e)}")
             return None
+        
+        # 同一文件未修改时复用已解析的结果，返回副本避免调用方修改缓存
+        article_info = _load_article_info(html_file_path, stat.st_mtime_ns, stat.st_size)
+        return dict(article_info) if article_info else None
     
-    def generate_json_metadata(self, article_info):
+    def generate_json_metadata(self, article_info, now_str=None):
         """生成文章的JSON元数据
         
         Args:
             article_info (dict): 文章信息
+            now_str (str, optional): 处理时间字符串，批量处理时由调用方统一传入. 默认为当前北京时间
             
         Returns:
             str: JSON格式的元数据
@@ -146,23 +318,27 @@ class ArticleFormatter:
             'version_number': article_info['version_number'],
             'article_number': article_info['article_number'],
             'original_url': article_info['original_url'],
-            'processed_time': datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+            'processed_time': now_str or _now_str()
         }
         
         try:
             # 转换为JSON字符串
-            json_data = json.dumps(metadata, ensure_ascii=False, indent=2)
-            logger.info("成功生成JSON元数据")
+            if has_orjson:
+                json_data = orjson.dumps(metadata, option=orjson.OPT_INDENT_2).decode('utf-8')
+            else:
+                json_data = json.dumps(metadata, ensure_ascii=False, indent=2)
+            logger.debug("成功生成JSON元数据")
             return json_data
         except Exception as e:
             logger.error(f"生成JSON元数据时出错: {str(e)}")
             return "{}"
     
-    def generate_markdown_article(self, article_info):
+    def generate_markdown_article(self, article_info, now_str=None):
         """从文章信息生成Markdown格式的文章
         
         Args:
             article_info (dict): 文章信息
+            now_str (str, optional): 处理时间字符串，批量处理时由调用方统一传入. 默认为当前北京时间
             
         Returns:
             str: Markdown格式的文章内容
@@ -172,46 +348,44 @@ class ArticleFormatter:
             return ""
         
         try:
-            # 提取纯文本内容
-            content_html = article_info['content']
-            soup = BeautifulSoup(content_html, 'html.parser')
-            
-            # 从HTML中提取段落文本
-            paragraphs = []
-            for p in soup.find_all('p'):
-                text = p.get_text(strip=True)
-                if text:
-                    paragraphs.append(text)
+            # 优先使用提取时缓存的段落文本
+            paragraphs = article_info.get('_paragraphs')
+            if paragraphs is None:
+                # 从HTML中提取段落文本
+                paragraphs = _paragraph_texts(_parse_content_html(article_info['content']))
             
             # 生成frontmatter元数据
-            frontmatter = "---\n"
-            frontmatter += f"title: {article_info['title']}\n"
-            frontmatter += f"date: {article_info['date']}\n"
-            frontmatter += f"author: {article_info['author']}\n"
-            frontmatter += f"version: {article_info['version']}\n"
-            frontmatter += f"source: 人民日报\n"
-            frontmatter += f"original_url: {article_info['original_url']}\n"
-            frontmatter += "---\n\n"
+            parts = [
+                "---\n",
+                f"title: {article_info['title']}\n",
+                f"date: {article_info['date']}\n",
+                f"author: {article_info['author']}\n",
+                f"version: {article_info['version']}\n",
+                "source: 人民日报\n",
+                f"original_url: {article_info['original_url']}\n",
+                "---\n\n",
+            ]
             
             # 生成Markdown内容
-            md_content = frontmatter
-            md_content += f"# {article_info['title']}\n\n"
+            parts.append(f"# {article_info['title']}\n\n")
             
             # 添加元数据区域
-            md_content += f"**作者**: {article_info['author']}  \n"
-            md_content += f"**日期**: {article_info['date']}  \n"
-            md_content += f"**版面**: {article_info['version']}  \n\n"
+            parts.append(f"**作者**: {article_info['author']}  \n")
+            parts.append(f"**日期**: {article_info['date']}  \n")
+            parts.append(f"**版面**: {article_info['version']}  \n\n")
             
             # 添加正文内容
             for p in paragraphs:
-                md_content += f"{p}\n\n"
+                parts.append(f"{p}\n\n")
             
             # 添加页脚
-            md_content += "---\n\n"
-            md_content += f"*来源: [人民日报]({article_info['original_url']})*  \n"
-            md_content += f"*处理时间: {datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')} (北京时间)*\n"
+            parts.append("---\n\n")
+            parts.append(f"*来源: [人民日报]({article_info['original_url']})*  \n")
+            parts.append(f"*处理时间: {now_str or _now_str()} (北京时间)*\n")
             
-            logger.info("成功生成Markdown文章内容")
+            md_content = "".join(parts)
+            
+            logger.debug("成功生成Markdown文章内容")
             return md_content
             
         except Exception as e:
@@ -232,12 +406,11 @@ class ArticleFormatter:
             return ""
         
         try:
-            # 使用BeautifulSoup提取文本
-            soup = BeautifulSoup(article_info['content'], 'html.parser')
-            text = soup.get_text(strip=True)
-            
-            # 清理文本
-            text = re.sub(r'\s+', ' ', text).strip()
+            # 优先使用提取时缓存的纯文本（缓存被截断且长度不足时重新提取）
+            text = article_info.get('_plain_text')
+            if text is None or (article_info.get('_plain_text_truncated') and len(text) <= max_length):
+                # 从HTML中提取文本，只遍历到摘要所需长度
+                text, _ = _text_prefix(_parse_content_html(article_info['content']), max_length)
             
             # 截取摘要
             if len(text) > max_length:
@@ -251,16 +424,146 @@ class ArticleFormatter:
             logger.error(f"生成摘要时出错: {str(e)}")
             return ""
     
-    def process_article_files(self, input_dir, output_dir=None, format_type="markdown"):
+    def _render_file(self, html_file, format_type, now_str=None):
+        """生成单个文章HTML文件对应的输出内容
+        
+        Args:
+            html_file (str): HTML文件路径
+            format_type (str): 输出格式，可选值: "markdown", "json", "all"
+            now_str (str, optional): 处理时间字符串
+            
+        Returns:
+            list: (输出文件名, 文件内容) 元组列表，失败时返回None
+        """
+        try:
+            # 提取文件名 (不含路径和扩展名)
+            file_name = _output_base_name(html_file)
+            
+            # 提取文章信息
+            article_info = self.extract_article_info(html_file)
+            
+            if not article_info:
+                logger.error(f"无法处理文件: {html_file}")
+                return None
+            
+            outputs = []
+            
+            # 根据请求的格式生成输出
+            if format_type in ["markdown", "all"]:
+                outputs.append((f"{file_name}.md", self.generate_markdown_article(article_info, now_str)))
+            
+            if format_type in ["json", "all"]:
+                outputs.append((f"{file_name}.json", self.generate_json_metadata(article_info, now_str)))
+            
+            return outputs
+            
+        except Exception as e:
+            logger.error(f"处理文件 {html_file} 时出错: {str(e)}")
+            return None
+    
+    def _convert_file(self, html_file, output_dir, format_type, aggregate=False, now_str=None):
+        """转换单个文章HTML文件
+        
+        Args:
+            html_file (str): HTML文件路径
+            output_dir (str): 输出目录路径
+            format_type (str): 输出格式，可选值: "markdown", "json", "all"
+            aggregate (bool): 为True时不写文件，直接返回生成的内容，由调用方汇总写入
+            now_str (str, optional): 处理时间字符串
+            
+        Returns:
+            tuple: (文件路径, 结果)，结果为是否成功；aggregate模式下为输出内容列表，失败时为None
+        """
+        outputs = self._render_file(html_file, format_type, now_str)
+        if aggregate or outputs is None:
+            return html_file, outputs if aggregate else False
+        
+        try:
+            # 输出目录前缀（带路径分隔符）只拼接一次
+            output_prefix = os.path.join(output_dir, '')
+            for output_name, content in outputs:
+                output_file = f"{output_prefix}{output_name}"
+                with open(output_file, 'wb') as f:
+                    f.write(content.encode('utf-8'))
+                logger.debug("生成文件: %s", output_file)
+            
+            return html_file, True
+            
+        except Exception as e:
+            logger.error(f"处理文件 {html_file} 时出错: {str(e)}")
+            return html_file, False
+    
+    def write_aggregate(self, output_dir, rendered):
+        """将所有输出内容写入单个tar归档文件，并生成偏移量索引
+        
+        Args:
+            output_dir (str): 输出目录路径
+            rendered (list): (输出文件名, 文件内容) 元组列表
+            
+        Returns:
+            str: 归档文件路径
+        """
+        archive_path = os.path.join(output_dir, AGGREGATE_ARCHIVE)
+        index = {}
+        mtime = int(time.time())
+        
+        with tarfile.open(archive_path, 'w') as tar:
+            for output_name, content in rendered:
+                data = content.encode('utf-8')
+                info = tarfile.TarInfo(name=output_name)
+                info.size = len(data)
+                info.mtime = mtime
+                tar.addfile(info, io.BytesIO(data))
+                # 数据块按512字节对齐，由写入后的位置倒推正文起始偏移
+                padded_size = -(-info.size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+                index[output_name] = {'offset': tar.offset - padded_size, 'length': info.size}
+        
+        with open(os.path.join(output_dir, AGGREGATE_INDEX), 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        
+        logger.info(f"已将 {len(index)} 个文件写入归档: {archive_path}")
+        return archive_path
+    
+    def _is_up_to_date(self, html_file, output_dir, format_type):
+        """判断文章的输出文件是否均已存在且比源HTML文件新
+        
+        Args:
+            html_file (str): HTML文件路径
+            output_dir (str): 输出目录路径
+            format_type (str): 输出格式，可选值: "markdown", "json", "all"
+            
+        Returns:
+            bool: 输出均为最新时返回True
+        """
+        extensions = _OUTPUT_EXTENSIONS.get(format_type, ())
+        output_base = f"{os.path.join(output_dir, '')}{_output_base_name(html_file)}"
+        
+        try:
+            source_mtime = os.stat(html_file).st_mtime
+            for ext in extensions:
+                if os.stat(f"{output_base}{ext}").st_mtime <= source_mtime:
+                    return False
+        except OSError:
+            return False
+        
+        return bool(extensions)
+    
+    def process_article_files(self, input_dir, output_dir=None, format_type="markdown", max_workers=None, aggregate=False, force=True, use_threads=False):
         """处理指定目录下的所有文章HTML文件
         
         Args:
             input_dir (str): 输入目录路径
             output_dir (str, optional): 输出目录路径
             format_type (str): 输出格式，可选值: "markdown", "json", "all"
+            max_workers (int, optional): 并行进程数. 默认为None，使用CPU核心数；
+                文件数少于PROCESS_POOL_MIN_FILES时不使用进程池
+            aggregate (bool): 是否将所有输出写入单个归档文件 (articles.tar + index.json)
+            force (bool): 是否转换全部文件. 默认为True；为False时跳过输出已是最新的文件
+            use_threads (bool): 使用线程池代替进程池。lxml解析时会释放GIL，
+                小文件（<10KB）较多时线程池没有进程间通信开销，通常更快；大文件仍建议使用进程池
             
         Returns:
-            dict: 处理结果，包含成功和失败的文件列表
+            dict: 处理结果，包含成功、失败和跳过的文件列表
         """
         if output_dir is None:
             output_dir = input_dir
@@ -270,79 +573,117 @@ class ArticleFormatter:
         
         result = {
             'success': [],
-            'failed': []
+            'failed': [],
+            'skipped': []
         }
         
         # 查找所有符合命名模式的HTML文件
-        pattern = r'\d{8}-\d{4}\.html'
-        html_files = []
-        
-        for file in os.listdir(input_dir):
-            if re.match(pattern, file):
-                html_files.append(os.path.join(input_dir, file))
+        with os.scandir(input_dir) as entries:
+            html_files = [entry.path for entry in entries
+                          if _ARTICLE_FILE_RE.fullmatch(entry.name) and entry.is_file()]
         
         logger.info(f"找到 {len(html_files)} 个文章HTML文件")
         
-        for html_file in html_files:
-            try:
-                # 提取文件名 (不含路径和扩展名)
-                file_base = os.path.basename(html_file)
-                file_name = os.path.splitext(file_base)[0]
-                
-                # 提取文章信息
-                article_info = self.extract_article_info(html_file)
-                
-                if not article_info:
-                    logger.error(f"无法处理文件: {html_file}")
-                    result['failed'].append(html_file)
-                    continue
-                
-                # 根据请求的格式生成输出
-                if format_type in ["markdown", "all"]:
-                    # 生成Markdown文件
-                    md_content = self.generate_markdown_article(article_info)
-                    md_file = os.path.join(output_dir, f"{file_name}.md")
-                    
-                    with open(md_file, 'w', encoding='utf-8') as f:
-                        f.write(md_content)
-                    
-                    logger.info(f"生成Markdown文件: {md_file}")
-                
-                if format_type in ["json", "all"]:
-                    # 生成JSON元数据文件
-                    json_content = self.generate_json_metadata(article_info)
-                    json_file = os.path.join(output_dir, f"{file_name}.json")
-                    
-                    with open(json_file, 'w', encoding='utf-8') as f:
-                        f.write(json_content)
-                    
-                    logger.info(f"生成JSON元数据文件: {json_file}")
-                
-                # 记录成功处理的文件
+        # 增量转换（force=False时）：跳过输出比源文件新的文章（归档模式需要全部内容，不跳过）
+        if not force and not aggregate:
+            pending_files = []
+            for html_file in html_files:
+                if self._is_up_to_date(html_file, output_dir, format_type):
+                    result['skipped'].append(html_file)
+                else:
+                    pending_files.append(html_file)
+            html_files = pending_files
+            
+            if result['skipped']:
+                logger.info(f"跳过 {len(result['skipped'])} 个输出已是最新的文件")
+        
+        # 同一批次的文章使用相同的处理时间
+        now_str = _now_str()
+        
+        # 各文件相互独立，文件较多时使用进程池并行处理；文件较少时直接串行处理，避免进程启动开销
+        if max_workers is None:
+            max_workers = (os.cpu_count() or 1) * (2 if use_threads else 1)
+        
+        if use_threads and max_workers > 1 and len(html_files) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(html_files))) as executor:
+                outcomes = list(executor.map(
+                    lambda html_file: self._convert_file(html_file, output_dir, format_type, aggregate, now_str),
+                    html_files
+                ))
+        elif max_workers > 1 and len(html_files) >= PROCESS_POOL_MIN_FILES:
+            workers = min(max_workers, len(html_files))
+            # 按任务量分块以摊薄进程间通信开销，同时保证每个进程都能分到任务
+            chunksize = max(1, min(16, len(html_files) // (workers * 4)))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                outcomes = list(executor.map(
+                    _convert_one,
+                    html_files,
+                    [output_dir] * len(html_files),
+                    [format_type] * len(html_files),
+                    [aggregate] * len(html_files),
+                    [now_str] * len(html_files),
+                    chunksize=chunksize
+                ))
+        else:
+            outcomes = [self._convert_file(html_file, output_dir, format_type, aggregate, now_str) for html_file in html_files]
+        
+        rendered = []
+        for html_file, ok in outcomes:
+            if ok:
                 result['success'].append(html_file)
-                
-            except Exception as e:
-                logger.error(f"处理文件 {html_file} 时出错: {str(e)}")
+                if aggregate:
+                    rendered.extend(ok)
+            else:
                 result['failed'].append(html_file)
         
-        logger.info(f"处理完成. 成功: {len(result['success'])}, 失败: {len(result['failed'])}")
+        if aggregate:
+            try:
+                result['archive_path'] = self.write_aggregate(output_dir, rendered)
+            except Exception as e:
+                logger.error(f"写入归档文件时出错: {str(e)}")
+                result['failed'].extend(result['success'])
+                result['success'] = []
+        
+        logger.info(f"处理完成. 成功: {len(result['success'])}, 失败: {len(result['failed'])}, 跳过: {len(result['skipped'])}")
         return result
 
-def process_articles(input_dir=None, output_dir=None, format_type="markdown"):
+# 创建默认文章格式化器实例，进程内共享（进程池中每个工作进程各创建一次）
+default_formatter = ArticleFormatter()
+
+def _convert_one(html_file, output_dir, format_type, aggregate=False, now_str=None):
+    """进程池工作函数：转换单个文章HTML文件
+    
+    Args:
+        html_file (str): HTML文件路径
+        output_dir (str): 输出目录路径
+        format_type (str): 输出格式
+        aggregate (bool): 是否只返回生成内容而不写文件
+        now_str (str, optional): 处理时间字符串
+        
+    Returns:
+        tuple: (文件路径, 结果)
+    """
+    return default_formatter._convert_file(html_file, output_dir, format_type, aggregate, now_str)
+
+def process_articles(input_dir=None, output_dir=None, format_type="markdown", max_workers=None, aggregate=False, force=True, use_threads=False):
     """处理文章的外部接口函数
     
     Args:
         input_dir (str, optional): 输入目录. 默认为None，使用默认输出目录
         output_dir (str, optional): 输出目录. 默认为None，与输入目录相同
         format_type (str): 输出格式，可选值: "markdown", "json", "all"
+        max_workers (int, optional): 并行进程数. 默认为None，使用CPU核心数
+        aggregate (bool): 是否将所有输出写入单个归档文件
+        force (bool): 是否转换全部文件. 默认为True；为False时跳过输出已是最新的文件
+        use_threads (bool): 使用线程池代替进程池
         
     Returns:
         dict: 处理结果
     """
-    formatter = ArticleFormatter()
+    formatter = default_formatter
     
     # 使用默认输出目录
     if input_dir is None:
         input_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "output")
     
-    return formatter.process_article_files(input_dir, output_dir, format_type) 
\ No newline at end of file
+    return formatter.process_article_files(input_dir, output_dir, format_type, max_workers, aggregate, force, use_threads) 
\ No newline at end of file
@@ -6,9 +6,10 @@ import sys
 import logging
 import argparse
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
 
-from converter.article_formatter import ArticleFormatter, process_articles
+from converter.article_formatter import default_formatter, process_articles
+from utils.file_utils import write_file
 
 # 配置日志
 logging.basicConfig(
@@ -19,6 +20,9 @@ logging.basicConfig(
     ]
 )
 
+# 北京时区，模块加载时解析一次
+SHANGHAI_TZ = ZoneInfo('Asia/Shanghai')
+
 logger = logging.getLogger("ArticleConverterMain")
 
 class ArticleConverter:
@@ -44,36 +48,35 @@ class ArticleConverter:
             
         os.makedirs(self.output_dir, exist_ok=True)
         
-        # 创建文章格式化器
-        self.formatter = ArticleFormatter()
+        # 使用共享的文章格式化器
+        self.formatter = default_formatter
     
     def save_file(self, content, filepath):
         """保存内容到文件
         
         Args:
-            content (str): 文件内容
+            content (str|bytes): 文件内容，bytes将直接写入
             filepath (str): 文件路径
             
         Returns:
             str: 保存的文件路径
         """
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-        logger.info(f"已保存到: {filepath}")
-        return filepath
+        return save_file(content, filepath)
     
-    def convert_html_to_markdown(self, html_file_path, output_path=None):
+    def convert_html_to_markdown(self, html_file_path, output_path=None, article_info=None):
         """将HTML文件转换为Markdown
         
         Args:
             html_file_path (str): HTML文件路径
             output_path (str, optional): 输出文件路径，不含扩展名
+            article_info (dict, optional): 已提取的文章信息，提供时不再重复解析HTML
             
         Returns:
             str: 生成的Markdown文件路径，或失败时返回None
         """
         # 提取文章信息
-        article_info = self.formatter.extract_article_info(html_file_path)
+        if article_info is None:
+            article_info = self.formatter.extract_article_info(html_file_path)
         if not article_info:
             logger.error(f"无法提取文章信息: {html_file_path}")
             return None
@@ -101,18 +104,20 @@ class ArticleConverter:
             logger.error(f"保存Markdown文件失败: {str(e)}")
             return None
     
-    def convert_html_to_json(self, html_file_path, output_path=None):
+    def convert_html_to_json(self, html_file_path, output_path=None, article_info=None):
         """将HTML文件转换为JSON元数据
         
         Args:
             html_file_path (str): HTML文件路径
             output_path (str, optional): 输出文件路径，不含扩展名
+            article_info (dict, optional): 已提取的文章信息，提供时不再重复解析HTML
             
         Returns:
             str: 生成的JSON文件路径，或失败时返回None
         """
         # 提取文章信息
-        article_info = self.formatter.extract_article_info(html_file_path)
+        if article_info is None:
+            article_info = self.formatter.extract_article_info(html_file_path)
         if not article_info:
             logger.error(f"无法提取文章信息: {html_file_path}")
             return None
@@ -140,11 +145,13 @@ class ArticleConverter:
             logger.error(f"保存JSON文件失败: {str(e)}")
             return None
     
-    def convert(self, format_type="markdown"):
+    def convert(self, format_type="markdown", aggregate=False, force=True):
         """执行转换流程
         
         Args:
             format_type (str): 输出格式，可选值: "markdown", "json", "all"
+            aggregate (bool): 目录模式下是否将所有输出写入单个归档文件
+            force (bool): 目录模式下是否转换全部文件，为False时跳过输出已是最新的文件
             
         Returns:
             dict: 包含转换结果的字典
@@ -171,17 +178,21 @@ class ArticleConverter:
             # 处理单个文件
             logger.info(f"处理单个文件: {self.input_path}")
             
-            # 根据格式类型进行转换
+            # 提取文章信息（只解析一次，供各输出格式和摘要共用）
+            article_info = self.formatter.extract_article_info(self.input_path)
+            if not article_info:
+                logger.error(f"无法提取文章信息: {self.input_path}")
+                return result
+            
+            # 根据格式类型转换，复用已提取的文章信息
             if format_type in ["markdown", "all"]:
-                result['markdown_path'] = self.convert_html_to_markdown(self.input_path)
+                result['markdown_path'] = self.convert_html_to_markdown(self.input_path, article_info=article_info)
             
             if format_type in ["json", "all"]:
-                result['json_path'] = self.convert_html_to_json(self.input_path)
+                result['json_path'] = self.convert_html_to_json(self.input_path, article_info=article_info)
             
             # 提取摘要
-            article_info = self.formatter.extract_article_info(self.input_path)
-            if article_info:
-                result['summary'] = self.formatter.generate_summary(article_info)
+            result['summary'] = self.formatter.generate_summary(article_info)
             
             # 检查是否成功
             if result['markdown_path'] or result['json_path']:
@@ -192,11 +203,13 @@ class ArticleConverter:
             logger.info(f"处理目录: {self.input_path}")
             
             # 调用处理目录的函数
-            dir_result = process_articles(self.input_path, self.output_dir, format_type)
+            dir_result = process_articles(self.input_path, self.output_dir, format_type, aggregate=aggregate, force=force)
             
-            # 更新结果
-            result['success'] = len(dir_result['success']) > 0
-            if result['success']:
+            # 更新结果（全部跳过也视为成功）
+            result['success'] = len(dir_result['success']) > 0 or len(dir_result['skipped']) > 0
+            if aggregate:
+                result['archive_path'] = dir_result.get('archive_path')
+            elif result['success']:
                 # 记录第一个成功的文件路径作为示例
                 if dir_result['success']:
                     first_file = os.path.splitext(dir_result['success'][0])[0]
@@ -207,9 +220,10 @@ class ArticleConverter:
             
             # 添加统计信息
             result['stats'] = {
-                'total': len(dir_result['success']) + len(dir_result['failed']),
+                'total': len(dir_result['success']) + len(dir_result['failed']) + len(dir_result['skipped']),
                 'success': len(dir_result['success']),
-                'failed': len(dir_result['failed'])
+                'failed': len(dir_result['failed']),
+                'skipped': len(dir_result['skipped'])
             }
         
         return result
@@ -218,26 +232,31 @@ def save_file(content, filepath):
     """保存内容到文件
     
     Args:
-        content (str): 文件内容
+        content (str|bytes): 文件内容，bytes将直接写入
         filepath (str): 文件路径
+        
+    Returns:
+        str: 保存的文件路径
     """
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
+    write_file(filepath, content)
     logger.info(f"已保存到: {filepath}")
+    return filepath
 
-def convert_article(input_path, output_dir=None, format_type="markdown"):
+def convert_article(input_path, output_dir=None, format_type="markdown", aggregate=False, force=True):
     """转换文章的外部接口函数
     
     Args:
         input_path (str): 输入文件或目录路径
         output_dir (str, optional): 输出目录
         format_type (str): 输出格式，可选值: "markdown", "json", "all"
+        aggregate (bool): 目录模式下是否将所有输出写入单个归档文件
+        force (bool): 目录模式下是否转换全部文件，为False时跳过输出已是最新的文件
         
     Returns:
         dict: 转换结果
     """
     converter = ArticleConverter(input_path, output_dir)
-    return converter.convert(format_type)
+    return converter.convert(format_type, aggregate, force)
 
 def process_directory(input_dir, output_dir=None, format_type="markdown"):
     """处理目录中的所有HTML文件
@@ -272,25 +291,32 @@ def main(args=None):
         parser.add_argument('--output', help='输出文件路径或目录')
         parser.add_argument('--format', choices=['markdown', 'json', 'all'], default='markdown',
                           help='输出格式 (默认: markdown)')
+        parser.add_argument('--aggregate', action='store_true',
+                          help='目录模式下将所有输出写入单个归档文件 (articles.tar + index.json)')
+        parser.add_argument('--incremental', action='store_true',
+                          help='目录模式下跳过输出已是最新的文件，只转换新增或修改的文章')
         args = parser.parse_args()
     
     # 获取当前北京时间
-    now = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+    now = datetime.now(SHANGHAI_TZ).strftime('%Y-%m-%d %H:%M:%S')
     logger.info(f"文章转换工具启动 (北京时间: {now})")
     
     # 执行转换
-    result = convert_article(args.input, args.output, args.format)
+    result = convert_article(args.input, args.output, args.format,
+                             getattr(args, 'aggregate', False), not getattr(args, 'incremental', False))
     
     # 输出结果信息
     if result['success']:
         logger.info("文章转换成功")
         if 'stats' in result:
-            logger.info(f"共处理 {result['stats']['total']} 个文件，成功 {result['stats']['success']} 个，失败 {result['stats']['failed']} 个")
+            logger.info(f"共处理 {result['stats']['total']} 个文件，成功 {result['stats']['success']} 个，失败 {result['stats']['failed']} 个，跳过 {result['stats']['skipped']} 个")
         else:
             if result['markdown_path']:
                 logger.info(f"Markdown文件: {result['markdown_path']}")
             if result['json_path']:
                 logger.info(f"JSON文件: {result['json_path']}")
+        if result.get('archive_path'):
+            logger.info(f"归档文件: {result['archive_path']}")
         return 0
     else:
         logger.error("文章转换失败")
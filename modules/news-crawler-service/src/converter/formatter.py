@@ -3,7 +3,10 @@
 
 import logging
 from datetime import datetime
-import pytz  # 添加pytz库导入
+from zoneinfo import ZoneInfo
+
+# 北京时区，模块加载时解析一次
+SHANGHAI_TZ = ZoneInfo('Asia/Shanghai')
 
 logger = logging.getLogger("MarkdownFormatter")
 
@@ -38,32 +41,36 @@ class MarkdownFormatter:
         # 格式化日期显示
         display_date = f"{date_string[:4]}年{date_string[4:6]}月{date_string[6:8]}日"
         
-        # 开始生成Markdown内容
-        md_content = self.add_frontmatter({
+        # 开始生成Markdown内容，各片段先收集到列表中最后统一拼接
+        parts = [self.add_frontmatter({
             'title': f"人民日报 - {display_date}",
             'description': "全版面新闻汇总",
             'sidebar': "auto"
-        })
+        })]
+        
+        parts.append(f"\n# 人民日报 - {display_date}\n\n全版面新闻汇总\n\n")
         
-        md_content += f"\n# 人民日报 - {display_date}\n\n全版面新闻汇总\n\n"
+        # 版面链接的公共前缀
+        layout_base = f"http://paper.people.com.cn/rmrb/pc/layout/{date_string[:6]}/{date_string[6:8]}"
         
         # 添加各版面内容
         for i, version in enumerate(versions_data, 1):
             # 构造版面页面的链接
-            version_url = f"http://paper.people.com.cn/rmrb/pc/layout/{date_string[:6]}/{date_string[6:8]}/node_{i:02d}.html"
+            version_url = f"{layout_base}/node_{i:02d}.html"
             
-            md_content += f"## [{version['title']}]({version_url})\n\n"
+            parts.append(f"## [{version['title']}]({version_url})\n\n")
             
             # 添加当前版面的新闻列表
-            for news in version['news']:
-                md_content += f"- [{news['title']}]({news['url']})\n"
+            parts.extend(f"- [{news['title']}]({news['url']})\n" for news in version['news'])
             
-            md_content += "\n"
+            parts.append("\n")
         
         # 添加页脚
-        md_content += f"---\n\n"
-        md_content += f"数据来源: 人民日报 - [http://paper.people.com.cn](http://paper.people.com.cn)  \n"
-        md_content += f"爬取时间: {datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')} (北京时间)\n"
+        parts.append("---\n\n")
+        parts.append("数据来源: 人民日报 - [http://paper.people.com.cn](http://paper.people.com.cn)  \n")
+        parts.append(f"爬取时间: {datetime.now(SHANGHAI_TZ).strftime('%Y-%m-%d %H:%M:%S')} (北京时间)\n")
+        
+        md_content = "".join(parts)
         
         logger.info("Markdown报告生成成功")
         return md_content
@@ -77,16 +84,8 @@ class MarkdownFormatter:
         Returns:
             str: 包含frontmatter的markdown文本
         """
-        frontmatter = "---\n"
-        
-        for key, value in metadata.items():
-            if isinstance(value, str):
-                frontmatter += f"{key}: {value}\n"
-            else:
-                frontmatter += f"{key}: {str(value)}\n"
-                
-        frontmatter += "---\n"
-        return frontmatter
+        lines = "".join(f"{key}: {value}\n" for key, value in metadata.items())
+        return f"---\n{lines}---\n"
     
     def organize_today_files(self, files, output_dir):
         """组织当天文件结构
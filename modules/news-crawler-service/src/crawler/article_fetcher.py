@@ -2,16 +2,119 @@
 # -*- coding: utf-8 -*-
 
 import os
+import asyncio
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
-import pytz
+from functools import lru_cache
+from zoneinfo import ZoneInfo
 import re
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve
 from urllib.parse import urljoin
 
 # 导入文章解析器
 from .article_parser import ArticleParser, parse_article_content
+from utils.file_utils import write_file
+
+# 北京时区，模块加载时解析一次
+SHANGHAI_TZ = ZoneInfo('Asia/Shanghai')
+
+# markdown汇总文件中01版部分、新闻链接以及URL中版面/文章编号的匹配模式
+_SECTION_RE = re.compile(r'## \[01版：.*?\]\(.*?\)(.*?)##', re.DOTALL)
+_LINK_RE = re.compile(r'- \[(.*?)\]\((http://.*?)\)')
+_NODE_RE = re.compile(r'node_(\d+)\.html')
+_CONTENT_RE = re.compile(r'content_(\d+)\.html')
+
+# 优先使用selectolax（lexbor）提取文章内容（更快），未安装时回退到BeautifulSoup
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    has_selectolax = True
+except ImportError:
+    has_selectolax = False
+
+# 安装requests_cache时为HTTP请求启用本地缓存，重复运行时无需重新下载页面
+try:
+    import requests_cache
+    has_requests_cache = True
+except ImportError:
+    has_requests_cache = False
+
+# HTTP缓存有效期（秒）
+HTTP_CACHE_EXPIRE = 3600
+
+# 指定HTTP缓存目录的环境变量
+HTTP_CACHE_DIR_ENV = "NEWS_HTTP_CACHE_DIR"
+
+def _http_cache_dir():
+    """获取HTTP缓存目录
+    
+    缓存不放在输出目录下，避免被工作流提交或被每日清理删除。
+    优先使用NEWS_HTTP_CACHE_DIR环境变量，其次为$XDG_CACHE_HOME/news-aggregator/http，
+    都未设置时为~/.cache/news-aggregator/http。
+    
+    Returns:
+        str: 缓存目录路径
+    """
+    cache_dir = os.environ.get(HTTP_CACHE_DIR_ENV)
+    if cache_dir:
+        return cache_dir
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'news-aggregator', 'http')
+
+# 是否启用selectolax提取路径
+USE_SELECTOLAX = True
+
+# 文章内容选择器，按顺序尝试（开销小、命中率高的在前）
+# 原先的完整路径选择器 "body > div.main.w1000 > ... > div.article" 及嵌套选择器
+# ".article-box .article" 能命中的元素都会先被 ".article" 命中，因此不再单独尝试
+ARTICLE_SELECTORS = [
+    ".article",  # 类名选择器
+    "#ozoom",    # ID选择器 (ozoom是一些新闻网站常用的文章内容容器ID)
+    ".article-content",  # 常见的文章内容类名
+    "[id^=articleContent]" # 以articleContent开头的ID
+]
+
+# 预编译的CSS选择器，避免每次提取时重复解析选择器
+COMPILED_ARTICLE_SELECTORS = [(selector, soupsieve.compile(selector)) for selector in ARTICLE_SELECTORS]
+
+# 只构建文章容器（class为article）子树的过滤器，用于快速判断最高优先级的".article"选择器
+ARTICLE_CONTAINER_STRAINER = SoupStrainer(class_='article')
+
+@lru_cache(maxsize=64)
+def _parse_md_file(md_filepath, mtime_ns, size):
+    """按 (文件路径, 修改时间, 文件大小) 缓存markdown汇总文件中01版第一条链接的查找结果
+    
+    Args:
+        md_filepath (str): markdown文件路径
+        mtime_ns (int): 文件修改时间（纳秒），文件被修改后缓存自动失效
+        size (int): 文件大小
+        
+    Returns:
+        tuple: (是否找到01版部分, 第一条链接的(标题, URL)，未找到链接时为None)
+    """
+    with open(md_filepath, 'r', encoding='utf-8') as f:
+        md_content = f.read()
+    
+    # 查找01版部分及其链接
+    match = _SECTION_RE.search(md_content)
+    if not match:
+        return False, None
+    
+    # 从该部分内容中提取第一条链接
+    link = _LINK_RE.search(match.group(1))
+    return True, (link.group(1), link.group(2)) if link else None
+
+logger = logging.getLogger("ArticleContentFetcher")
+
+# 配置日志记录器（模块导入时执行一次）
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
 
 class ArticleContentFetcher:
     """
@@ -28,13 +131,6 @@ class ArticleContentFetcher:
             output_dir (str, optional): 输出目录，默认为src/output
         """
         self.base_url = base_url
-        self.session = requests.Session()
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-            'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-            'Connection': 'keep-alive'
-        }
         
         # 设置输出目录
         if output_dir is None:
@@ -44,14 +140,37 @@ class ArticleContentFetcher:
             
         os.makedirs(self.output_dir, exist_ok=True)
         
-        # 配置日志记录器
-        self.logger = logging.getLogger("ArticleContentFetcher")
-        if not self.logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
-            self.logger.setLevel(logging.INFO)
+        # 缓存文件放在输出目录之外，缓存不可用时使用普通会话
+        if has_requests_cache:
+            cache_dir = _http_cache_dir()
+            os.makedirs(cache_dir, exist_ok=True)
+            self.session = requests_cache.CachedSession(
+                cache_name=os.path.join(cache_dir, 'http_cache'),
+                expire_after=HTTP_CACHE_EXPIRE,
+                allowable_codes=(200,)
+            )
+        else:
+            self.session = requests.Session()
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+            'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
+            'Connection': 'keep-alive'
+        }
+        # 请求头只在会话上设置一次，后续请求无需逐次传入
+        self.session.headers.update(self.headers)
+        
+        # 复用连接池，并对服务端临时错误自动重试
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504])
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # 使用模块级日志记录器
+        self.logger = logger
         
         # 创建文章解析器实例
         self.parser = ArticleParser()
@@ -67,7 +186,7 @@ class ArticleContentFetcher:
         """
         # 如果未指定日期，使用当天日期（中国时区）
         if date_string is None:
-            today = datetime.now(pytz.timezone('Asia/Shanghai'))
+            today = datetime.now(SHANGHAI_TZ)
             date_string = today.strftime('%Y%m%d')
         
         # 尝试查找指定日期或前一天的markdown文件
@@ -95,38 +214,26 @@ class ArticleContentFetcher:
         self.logger.info(f"从markdown文件获取链接: {md_filepath}")
         
         try:
-            # 读取markdown文件内容
-            with open(md_filepath, 'r', encoding='utf-8') as f:
-                md_content = f.read()
-            
-            # 查找01版部分及其链接
-            pattern = r'## \[01版：.*?\]\(.*?\)(.*?)##'
-            match = re.search(pattern, md_content, re.DOTALL)
+            # 同一文件未修改时直接复用上次的查找结果
+            stat = os.stat(md_filepath)
+            section_found, first_link = _parse_md_file(md_filepath, stat.st_mtime_ns, stat.st_size)
             
             # 默认版面号和文章序号
             version_number = "01"
             article_number = "01"
             
-            if match:
-                section_content = match.group(1)
-                
-                # 从该部分内容中提取所有链接
-                links = re.findall(r'- \[(.*?)\]\((http://.*?)\)', section_content)
-                
-                if len(links) >= 1:  # 大于等于一个链接时
-                    article_url = links[0][1]
-                    article_title = links[0][0]
+            if section_found:
+                if first_link:  # 找到链接时
+                    article_title, article_url = first_link
                     self.logger.info(f"找到第一条链接: {article_title}, URL: {article_url}")
                     
                     # 尝试从URL中提取版面和文章编号
-                    url_pattern = r'node_(\d+)\.html'
-                    version_match = re.search(url_pattern, article_url)
+                    version_match = _NODE_RE.search(article_url)
                     if version_match:
                         version_number = version_match.group(1)
                     
                     # 尝试从文章URL中提取文章编号
-                    content_pattern = r'content_(\d+)\.html'
-                    content_match = re.search(content_pattern, article_url)
+                    content_match = _CONTENT_RE.search(article_url)
                     if content_match:
                         # 如果有文章编号，将其作为序号的一部分
                         article_number = "01"  # 默认为01
@@ -155,10 +262,11 @@ class ArticleContentFetcher:
         self.logger.info(f"获取文章内容: {article_url}")
         
         try:
-            response = self.session.get(article_url, headers=self.headers)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
-            return response.text
+            # 以流式方式请求，状态码异常时不再下载响应体
+            with self.session.get(article_url, stream=True) as response:
+                response.raise_for_status()
+                # 页面固定为UTF-8编码，直接解码字节内容，跳过requests的编码探测
+                return response.content.decode('utf-8', 'replace')
         except requests.exceptions.RequestException as e:
             self.logger.error(f"获取文章内容失败: {str(e)}")
             return None
@@ -172,53 +280,117 @@ class ArticleContentFetcher:
         Returns:
             str: 提取后的文章HTML内容
         """
+        article_content, _ = self._extract_article(html_content)
+        return article_content
+    
+    def _extract_article(self, html_content):
+        """提取文章主体内容，并顺带取出其中的标题
+        
+        标题从提取时已构建的节点上读取，供解析器直接使用，避免再次解析文章内容。
+        
+        Args:
+            html_content (str): 完整的HTML内容
+            
+        Returns:
+            tuple: (提取后的文章HTML内容, 文章标题)，标题无法确定时为None
+        """
         self.logger.info("提取文章主体内容")
         
         if not html_content:
-            return None
+            return None, None
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # 尝试多种选择器查找文章内容
-            article_div = None
-            article_selectors = [
-                "body > div.main.w1000 > div.right.right-main > div.article-box > div.article",  # 原始选择器
-                ".article",  # 类名选择器
-                "#ozoom",    # ID选择器 (ozoom是一些新闻网站常用的文章内容容器ID)
-                ".article-box .article",  # 嵌套选择器
-                ".article-content",  # 常见的文章内容类名
-                "[id^=articleContent]" # 以articleContent开头的ID
-            ]
-            
-            for selector in article_selectors:
-                article_div = soup.select_one(selector)
-                if article_div:
-                    self.logger.info(f"找到文章内容，使用选择器: {selector}")
-                    break
+            if USE_SELECTOLAX and has_selectolax:
+                article_html, title, paragraphs = self._select_with_selectolax(html_content)
+            else:
+                article_html, title, paragraphs = self._select_with_soup(html_content)
             
-            if article_div:
+            if article_html:
                 # 保留原始HTML结构
                 self.logger.info("成功提取文章主体内容")
-                return str(article_div)
+                return article_html, title
             else:
                 # 如果所有选择器都失败，尝试最后的备选方案
                 # 查找所有<p>标签，可能是正文段落
-                paragraphs = soup.find_all('p')
                 if len(paragraphs) > 3:  # 如果至少有几个段落
-                    # 将所有段落组合成HTML
-                    content = '<div class="extracted-content">\n'
-                    for p in paragraphs:
-                        content += str(p) + '\n'
-                    content += '</div>'
+                    # 将所有段落组合成HTML（收集后一次性拼接）
+                    content = '<div class="extracted-content">\n' + ''.join(p + '\n' for p in paragraphs) + '</div>'
                     self.logger.info("使用段落提取方法找到文章内容")
-                    return content
+                    return content, None
                 
                 self.logger.warning("未找到文章主体内容")
-                return None
+                return None, None
         except Exception as e:
             self.logger.error(f"提取文章内容时出错: {str(e)}")
-            return None
+            return None, None
+    
+    def _select_with_selectolax(self, html_content):
+        """使用selectolax查找文章主体内容
+        
+        Args:
+            html_content (str): 完整的HTML内容
+            
+        Returns:
+            tuple: (文章主体HTML或None, 文章标题, 未找到主体时的全部<p>标签HTML列表)
+        """
+        tree = LexborHTMLParser(html_content)
+        
+        for selector in ARTICLE_SELECTORS:
+            node = tree.css_first(selector)
+            if node is not None:
+                self.logger.info(f"找到文章内容，使用选择器: {selector}")
+                # 取第一个非空的h1/h2/h3文本作为标题
+                title = ""
+                for heading in node.css('h1, h2, h3'):
+                    title = heading.text(strip=True)
+                    if title:
+                        break
+                return node.html, title, []
+        
+        return None, None, [node.html for node in tree.css('p')]
+    
+    def _select_with_soup(self, html_content):
+        """使用BeautifulSoup查找文章主体内容
+        
+        Args:
+            html_content (str): 完整的HTML内容
+            
+        Returns:
+            tuple: (文章主体HTML或None, 文章标题, 未找到主体时的全部<p>标签HTML列表)
+        """
+        # 先只解析文章容器子树，最高优先级的选择器命中时无需构建整棵文档树
+        # 其余选择器的优先级可能高于过滤后子树中的元素（如#ozoom），只能在完整文档上判断
+        soup = BeautifulSoup(html_content, 'html.parser', parse_only=ARTICLE_CONTAINER_STRAINER)
+        selector, compiled = COMPILED_ARTICLE_SELECTORS[0]
+        article_div = compiled.select_one(soup)
+        if article_div:
+            self.logger.info(f"找到文章内容，使用选择器: {selector}")
+            return str(article_div), self._heading_text(article_div), []
+        
+        # 未命中时完整解析，按选择器优先级和段落方式查找
+        soup = BeautifulSoup(html_content, 'html.parser')
+        for selector, compiled in COMPILED_ARTICLE_SELECTORS:
+            article_div = compiled.select_one(soup)
+            if article_div:
+                self.logger.info(f"找到文章内容，使用选择器: {selector}")
+                return str(article_div), self._heading_text(article_div), []
+        
+        return None, None, [str(p) for p in soup.find_all('p')]
+    
+    def _heading_text(self, element):
+        """获取元素内第一个非空的h1/h2/h3文本
+        
+        Args:
+            element (Tag): BeautifulSoup元素
+            
+        Returns:
+            str: 标题文本，没有非空标题时返回空字符串
+        """
+        for heading in element.find_all(['h1', 'h2', 'h3']):
+            text = heading.get_text(strip=True)
+            if text:
+                return text
+        return ""
     
     def save_article_html(self, html_content, date_string, version_number, article_number):
         """保存文章内容为HTML文件
@@ -242,8 +414,7 @@ class ArticleContentFetcher:
         
         try:
             # 保存HTML
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            write_file(filepath, html_content)
             self.logger.info(f"文章HTML已保存到: {filepath}")
             result['html_path'] = filepath
             
@@ -286,13 +457,13 @@ class ArticleContentFetcher:
             return result
         
         # 3. 提取文章主体内容
-        article_content = self.extract_article_content(html_content)
+        article_content, title = self._extract_article(html_content)
         if not article_content:
             self.logger.error("提取文章内容失败")
             return result
         
-        # 4. 将提取的内容传递给解析器生成完整HTML
-        readable_html = self.parser.generate_readable_html_from_content(article_content, article_url)
+        # 4. 将提取的内容及标题传递给解析器生成完整HTML
+        readable_html = self.parser.generate_readable_html_from_content(article_content, article_url, title)
         if not readable_html:
             self.logger.error("生成可读HTML失败")
             return result
@@ -306,6 +477,39 @@ class ArticleContentFetcher:
             self.logger.info(f"成功爬取并保存文章HTML到: {result['html_path']}")
         
         return result
+    
+    async def afetch_and_save_articles(self, date_strings, max_concurrency=4):
+        """并发获取并保存多个日期的文章
+        
+        每个日期的获取、提取和保存流程在线程中执行，多个日期的网络等待相互重叠，
+        适用于按日期批量回补的场景。
+        
+        Args:
+            date_strings (list): 日期字符串列表，格式YYYYMMDD
+            max_concurrency (int): 同时进行的最大请求数
+            
+        Returns:
+            list: 与date_strings顺序对应的结果字典列表
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _fetch(date_string):
+            async with semaphore:
+                return await asyncio.to_thread(self.fetch_and_save_article, date_string)
+        
+        return await asyncio.gather(*[_fetch(date_string) for date_string in date_strings])
+    
+    def fetch_and_save_articles(self, date_strings, max_concurrency=4):
+        """并发获取并保存多个日期的文章（同步接口）
+        
+        Args:
+            date_strings (list): 日期字符串列表，格式YYYYMMDD
+            max_concurrency (int): 同时进行的最大请求数
+            
+        Returns:
+            list: 与date_strings顺序对应的结果字典列表
+        """
+        return asyncio.run(self.afetch_and_save_articles(date_strings, max_concurrency))
 
 def fetch_first_article(date=None, output_dir=None):
     """获取并保存文章的外部接口函数
@@ -321,4 +525,20 @@ def fetch_first_article(date=None, output_dir=None):
     fetcher = ArticleContentFetcher(output_dir=output_dir)
     
     # 执行获取和保存操作
-    return fetcher.fetch_and_save_article(date) 
\ No newline at end of file
+    return fetcher.fetch_and_save_article(date) 
+
+def fetch_articles(dates, output_dir=None, max_concurrency=4):
+    """批量获取并保存多个日期文章的外部接口函数
+    
+    Args:
+        dates (list): 日期字符串列表，格式YYYYMMDD
+        output_dir (str, optional): 输出目录. 默认为None.
+        max_concurrency (int): 同时进行的最大请求数
+        
+    Returns:
+        list: 与dates顺序对应的结果字典列表
+    """
+    # 所有日期共用同一个爬虫对象及其HTTP会话
+    fetcher = ArticleContentFetcher(output_dir=output_dir)
+    
+    return fetcher.fetch_and_save_articles(dates, max_concurrency)
@@ -7,12 +7,12 @@ import time
 import re
 import logging
 from datetime import datetime, timedelta
-import pytz
+from zoneinfo import ZoneInfo
 import argparse
 
 # 导入自定义模块
-from crawler.article_fetcher import ArticleContentFetcher
-from crawler.article_parser import ArticleParser
+from crawler.article_fetcher import ArticleContentFetcher, fetch_articles
+from utils.file_utils import write_file
 
 # 配置日志
 logging.basicConfig(
@@ -23,6 +23,9 @@ logging.basicConfig(
     ]
 )
 
+# 北京时区，模块加载时解析一次
+SHANGHAI_TZ = ZoneInfo('Asia/Shanghai')
+
 logger = logging.getLogger("ArticleMain")
 
 class ArticleContentCrawler:
@@ -41,13 +44,14 @@ class ArticleContentCrawler:
         # 设置默认日期
         if date_string is None:
             # 使用当天日期（中国时区）
-            self.date_string = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y%m%d')
+            self.date_string = datetime.now(SHANGHAI_TZ).strftime('%Y%m%d')
         else:
             self.date_string = date_string
         
         # 初始化子模块
         self.fetcher = ArticleContentFetcher(output_dir=output_dir)
-        self.parser = ArticleParser()
+        # 复用获取器内部的文章解析器，无需再单独创建
+        self.parser = self.fetcher.parser
         
         # 设置输出目录
         if output_dir is None:
@@ -61,15 +65,14 @@ class ArticleContentCrawler:
         """保存内容到文件
         
         Args:
-            content (str): 文件内容
+            content (str|bytes): 文件内容，bytes将直接写入
             filename (str): 文件名
             
         Returns:
             str: 保存的文件路径
         """
         filepath = os.path.join(self.output_dir, filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        write_file(filepath, content)
         logger.info(f"已保存到: {filepath}")
         return filepath
     
@@ -124,19 +127,55 @@ def crawl_article(date=None, output_dir=None):
     # 执行爬取
     return crawler.crawl()
 
+def crawl_dates(dates, output_dir=None, max_concurrency=4):
+    """并发爬取人民日报多个日期的文章
+    
+    Args:
+        dates (list): 要爬取的日期列表，格式YYYYMMDD
+        output_dir (str, optional): 输出目录
+        max_concurrency (int): 同时进行的最大请求数
+        
+    Returns:
+        int: 全部成功返回0，否则返回1
+    """
+    # 验证日期格式
+    invalid_dates = [date for date in dates if not re.match(r'^\d{8}$', date)]
+    if invalid_dates:
+        logger.error(f"错误：日期格式不正确: {', '.join(invalid_dates)}，日期格式应为YYYYMMDD，例如：20250408")
+        return 1
+    
+    logger.info(f"开始并发爬取 {len(dates)} 个日期的首篇文章（并发数: {max_concurrency}）")
+    results = fetch_articles(dates, output_dir=output_dir, max_concurrency=max_concurrency)
+    
+    failed = 0
+    for date, result in zip(dates, results):
+        if result['success']:
+            logger.info(f"{date} 文章成功获取并保存到: {result['html_path']}")
+        else:
+            failed += 1
+            logger.error(f"{date} 文章获取失败")
+    
+    logger.info(f"批量爬取完成: 成功 {len(dates) - failed}/{len(dates)}")
+    return 0 if failed == 0 else 1
+
 def main():
     """文章爬虫主入口函数"""
     parser = argparse.ArgumentParser(description='人民日报单篇文章爬虫工具')
-    parser.add_argument('-d', '--date', help='指定日期，格式: YYYYMMDD，默认为今天')
+    parser.add_argument('-d', '--date', action='append', help='指定日期，格式: YYYYMMDD，默认为今天；可多次指定以并发爬取多个日期')
     parser.add_argument('-o', '--output_dir', help='输出目录路径')
+    parser.add_argument('-c', '--concurrency', type=int, default=4, help='爬取多个日期时同时进行的最大请求数')
     args = parser.parse_args()
     
     # 获取当前北京时间
-    china_time = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+    china_time = datetime.now(SHANGHAI_TZ).strftime('%Y-%m-%d %H:%M:%S')
     logger.info(f"人民日报文章爬虫启动 (北京时间: {china_time})")
     
+    # 指定多个日期时并发爬取
+    if args.date and len(args.date) > 1:
+        return crawl_dates(args.date, args.output_dir, args.concurrency)
+    
     # 执行爬取过程
-    result = crawl_article(args.date, args.output_dir)
+    result = crawl_article(args.date[0] if args.date else None, args.output_dir)
     
     # 根据爬取结果输出信息
     if result['success']:
@@ -2,11 +2,164 @@
 # -*- coding: utf-8 -*-
 
 from bs4 import BeautifulSoup
+import soupsieve
 from datetime import datetime
 import re
 import logging
 import os
-import pytz
+import string
+from zoneinfo import ZoneInfo
+
+from utils.file_utils import write_file
+
+# 北京时区，模块加载时解析一次
+SHANGHAI_TZ = ZoneInfo('Asia/Shanghai')
+
+# 预编译的正则表达式：URL中的日期、正文中的版面号、原文链接以及版面/文章编号
+_DATE_IN_URL_RE = re.compile(r'/(\d{6})/(\d{2})/')
+_VERSION_TEXT_RE = re.compile(r'第(\d+)版')
+_ORIG_URL_RE = re.compile(r'(http://paper\.people\.com\.cn/[^\s"\']+?\.html)')
+_NODE_RE = re.compile(r'node_(\d+)\.html')
+_CONTENT_RE = re.compile(r'content_(\d+)\.html')
+
+# 预编译的CSS选择器，避免每次解析文章时重复编译
+# 标题选择器，按顺序尝试
+_TITLE_SELECTORS = [soupsieve.compile(selector) for selector in (
+    "div.article h1",       # 标准选择器
+    "h1",                   # 直接查找h1
+    "div.article-box h1",   # 备选选择器
+    "h2.title",             # 有些可能用h2
+    "title"                 # 从title标签提取
+)]
+
+# 作者选择器，按顺序尝试
+_AUTHOR_SELECTORS = [soupsieve.compile(selector) for selector in (
+    "div.article p.sec",   # 常见作者位置
+    "p.author",            # 备选
+    "span.author"          # 备选
+)]
+
+# 正文选择器，按顺序尝试
+_CONTENT_SELECTORS = [soupsieve.compile(selector) for selector in (
+    "div#ozoom",           # 人民日报常用ID
+    "div.article",         # 常见文章内容容器
+    "div.article-content", # 备选
+    "div.content"          # 备选
+)]
+
+# 日期与版面信息选择器
+_NEWSTIME_SELECTOR = soupsieve.compile("span.newstime")
+_BAN_SELECTOR = soupsieve.compile("p.ban")
+_DATE_BOX_SELECTOR = soupsieve.compile("div.date-box p")
+
+# 可读HTML页面模板，模块加载时解析一次占位符
+_READABLE_HTML_TEMPLATE = string.Template("""
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>${title} - 人民日报</title>
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <style>
+        body {
+            font-family: "Microsoft YaHei", Arial, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 800px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f9f9f9;
+        }
+        .container {
+            background-color: #fff;
+            padding: 30px;
+            box-shadow: 0 0 10px rgba(0,0,0,0.1);
+            border-radius: 5px;
+        }
+        .header {
+            border-bottom: 2px solid #c00;
+            padding-bottom: 20px;
+            margin-bottom: 20px;
+        }
+        .title {
+            font-size: 24px;
+            font-weight: bold;
+            margin-bottom: 15px;
+            color: #c00;
+        }
+        .meta {
+            color: #666;
+            font-size: 14px;
+            margin-bottom: 20px;
+        }
+        .content {
+            font-size: 16px;
+            line-height: 1.8;
+        }
+        .content p {
+            margin-bottom: 15px;
+            text-indent: 2em;
+        }
+        .footer {
+            margin-top: 30px;
+            padding-top: 15px;
+            border-top: 1px solid #eee;
+            color: #999;
+            font-size: 12px;
+        }
+        .source-link {
+            margin-top: 20px;
+            font-size: 14px;
+        }
+        .source-link a {
+            color: #c00;
+            text-decoration: none;
+        }
+        .source-link a:hover {
+            text-decoration: underline;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1 class="title">${title}</h1>
+            <div class="meta">
+                <span>作者: ${author}</span>
+                <br>
+                <span>日期: ${date}</span>
+                <br>
+                <span>版面: ${version}</span>
+                <br>
+                <span>版面号: ${version_number}，文章序号: ${article_number}</span>
+            </div>
+        </div>
+        
+        <div class="content">
+            ${content}
+        </div>
+        
+        <div class="source-link">
+            <a href="${original_url}" target="_blank">查看原文</a>
+        </div>
+        
+        <div class="footer">
+            <p>来源: 人民日报</p>
+            <p>处理时间: ${now} (北京时间)</p>
+        </div>
+    </div>
+</body>
+</html>
+            """)
+
+logger = logging.getLogger("ArticleParser")
+
+# 配置日志记录器（模块导入时执行一次）
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
 
 class ArticleParser:
     """
@@ -18,14 +171,8 @@ class ArticleParser:
     
     def __init__(self):
         """初始化解析器"""
-        # 配置日志记录器
-        self.logger = logging.getLogger("ArticleParser")
-        if not self.logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
-            self.logger.setLevel(logging.INFO)
+        # 使用模块级日志记录器
+        self.logger = logger
     
     def parse_article(self, html_content):
         """
@@ -48,16 +195,8 @@ class ArticleParser:
             
             # 提取文章标题
             title_element = None
-            title_selectors = [
-                "div.article h1",       # 标准选择器
-                "h1",                   # 直接查找h1
-                "div.article-box h1",   # 备选选择器
-                "h2.title",             # 有些可能用h2
-                "title"                 # 从title标签提取
-            ]
-            
-            for selector in title_selectors:
-                title_element = soup.select_one(selector)
+            for selector in _TITLE_SELECTORS:
+                title_element = selector.select_one(soup)
                 if title_element and title_element.get_text(strip=True):
                     break
             
@@ -65,14 +204,8 @@ class ArticleParser:
             
             # 提取作者信息
             author = ""
-            author_selectors = [
-                "div.article p.sec",   # 常见作者位置
-                "p.author",            # 备选
-                "span.author"          # 备选
-            ]
-            
-            for selector in author_selectors:
-                author_element = soup.select_one(selector)
+            for selector in _AUTHOR_SELECTORS:
+                author_element = selector.select_one(soup)
                 if author_element and author_element.get_text(strip=True):
                     author = author_element.get_text(strip=True)
                     break
@@ -85,7 +218,7 @@ class ArticleParser:
             
             # 提取日期
             date = ""
-            date_elements = soup.select("span.newstime")
+            date_elements = _NEWSTIME_SELECTOR.select(soup)
             if date_elements:
                 for element in date_elements:
                     text = element.get_text(strip=True)
@@ -96,7 +229,7 @@ class ArticleParser:
             # 如果未找到日期，尝试从URL或其他位置提取
             if not date:
                 # 尝试从URL中提取日期 (从HTML内容中找)
-                date_match = re.search(r'/(\d{6})/(\d{2})/', html_content)
+                date_match = _DATE_IN_URL_RE.search(html_content)
                 if date_match:
                     year_month = date_match.group(1)
                     day = date_match.group(2)
@@ -104,7 +237,7 @@ class ArticleParser:
             
             # 提取版面信息
             version = ""
-            version_elements = soup.select("p.ban")
+            version_elements = _BAN_SELECTOR.select(soup)
             if version_elements:
                 for element in version_elements:
                     text = element.get_text(strip=True)
@@ -114,7 +247,7 @@ class ArticleParser:
             
             # 尝试其他方式获取版面信息
             if not version:
-                version_elements = soup.select("div.date-box p")
+                version_elements = _DATE_BOX_SELECTOR.select(soup)
                 if version_elements and len(version_elements) > 0:
                     version_text = version_elements[0].get_text(strip=True)
                     if "版：" in version_text:
@@ -123,21 +256,14 @@ class ArticleParser:
             # 提取版面号
             version_number = "01"  # 默认版面号
             if version:
-                version_match = re.search(r'第(\d+)版', version)
+                version_match = _VERSION_TEXT_RE.search(version)
                 if version_match:
                     version_number = version_match.group(1).zfill(2)  # 确保两位数
             
             # 提取正文内容
             content = ""
-            content_selectors = [
-                "div#ozoom",           # 人民日报常用ID
-                "div.article",         # 常见文章内容容器
-                "div.article-content", # 备选
-                "div.content"          # 备选
-            ]
-            
-            for selector in content_selectors:
-                content_element = soup.select_one(selector)
+            for selector in _CONTENT_SELECTORS:
+                content_element = selector.select_one(soup)
                 if content_element and content_element.get_text(strip=True):
                     # 保留HTML格式
                     content = str(content_element)
@@ -147,23 +273,23 @@ class ArticleParser:
             if not content:
                 paragraphs = soup.find_all('p')
                 if paragraphs:
-                    content = '<div class="article-content">'
-                    for p in paragraphs:
-                        if p.get_text(strip=True) and not p.find_parent('div', class_=["header", "footer"]):
-                            content += str(p)
-                    content += '</div>'
+                    # 预先收集页眉/页脚中的段落，避免对每个段落逐级查找父元素
+                    excluded = {id(p) for div in soup.find_all('div', class_=["header", "footer"]) for p in div.find_all('p')}
+                    parts = ['<div class="article-content">']
+                    parts.extend(str(p) for p in paragraphs if id(p) not in excluded and p.get_text(strip=True))
+                    parts.append('</div>')
+                    content = ''.join(parts)
             
             # 提取原文链接
             original_url = ""
-            url_pattern = r'(http://paper\.people\.com\.cn/[^\s"\']+?\.html)'
-            url_match = re.search(url_pattern, html_content)
+            url_match = _ORIG_URL_RE.search(html_content)
             if url_match:
                 original_url = url_match.group(1)
             
             # 尝试从URL中提取文章编号
             article_number = "01"  # 默认文章序号
             if original_url:
-                content_match = re.search(r'content_(\d+)\.html', original_url)
+                content_match = _CONTENT_RE.search(original_url)
                 if content_match:
                     # 仅使用末尾几位数字作为文章序号
                     content_id = content_match.group(1)
@@ -188,13 +314,14 @@ class ArticleParser:
             self.logger.error(f"解析文章时出错: {str(e)}")
             return None
     
-    def parse_article_content(self, article_content, original_url=""):
+    def parse_article_content(self, article_content, original_url="", title=None):
         """
         解析已提取的文章内容
         
         Args:
             article_content (str): 已提取的文章内容HTML
             original_url (str): 原始文章URL
+            title (str, optional): 提取时已得到的标题，提供时不再重新解析文章内容
             
         Returns:
             dict: 解析后的文章信息，包含标题、正文等
@@ -206,39 +333,40 @@ class ArticleParser:
             return None
         
         try:
-            soup = BeautifulSoup(article_content, 'html.parser')
-            
             # 尝试提取标题(可能已经提取出来的内容中没有标题)
-            title = "人民日报文章"
-            title_elements = soup.find_all(['h1', 'h2', 'h3'])
-            if title_elements:
-                for elem in title_elements:
-                    if elem.get_text(strip=True):
-                        title = elem.get_text(strip=True)
-                        break
+            if title is None:
+                soup = BeautifulSoup(article_content, 'html.parser')
+                title_elements = soup.find_all(['h1', 'h2', 'h3'])
+                if title_elements:
+                    for elem in title_elements:
+                        if elem.get_text(strip=True):
+                            title = elem.get_text(strip=True)
+                            break
+            if not title:
+                title = "人民日报文章"
             
             # 尝试从URL提取日期
             date = ""
-            date_match = re.search(r'/(\d{6})/(\d{2})/', original_url)
+            date_match = _DATE_IN_URL_RE.search(original_url)
             if date_match:
                 year_month = date_match.group(1)
                 day = date_match.group(2)
                 date = f"{year_month[:4]}年{year_month[4:6]}月{day}日"
             else:
                 # 使用当前日期
-                date = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y年%m月%d日')
+                date = datetime.now(SHANGHAI_TZ).strftime('%Y年%m月%d日')
                 
             # 提取版面号
             version_number = "01"  # 默认版面号
             if original_url:
-                version_match = re.search(r'node_(\d+)\.html', original_url)
+                version_match = _NODE_RE.search(original_url)
                 if version_match:
                     version_number = version_match.group(1)
             
             # 提取文章序号
             article_number = "01"  # 默认文章序号
             if original_url:
-                content_match = re.search(r'content_(\d+)\.html', original_url)
+                content_match = _CONTENT_RE.search(original_url)
                 if content_match:
                     # 可以根据需要处理文章编号，这里简单取最后两位
                     content_id = content_match.group(1)
@@ -280,106 +408,19 @@ class ArticleParser:
         
         try:
             # 获取当前时间（北京时间）
-            now = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
-            
-            html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <title>{article_info['title']} - 人民日报</title>
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <style>
-        body {{
-            font-family: "Microsoft YaHei", Arial, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f9f9f9;
-        }}
-        .container {{
-            background-color: #fff;
-            padding: 30px;
-            box-shadow: 0 0 10px rgba(0,0,0,0.1);
-            border-radius: 5px;
-        }}
-        .header {{
-            border-bottom: 2px solid #c00;
-            padding-bottom: 20px;
-            margin-bottom: 20px;
-        }}
-        .title {{
-            font-size: 24px;
-            font-weight: bold;
-            margin-bottom: 15px;
-            color: #c00;
-        }}
-        .meta {{
-            color: #666;
-            font-size: 14px;
-            margin-bottom: 20px;
-        }}
-        .content {{
-            font-size: 16px;
-            line-height: 1.8;
-        }}
-        .content p {{
-            margin-bottom: 15px;
-            text-indent: 2em;
-        }}
-        .footer {{
-            margin-top: 30px;
-            padding-top: 15px;
-            border-top: 1px solid #eee;
-            color: #999;
-            font-size: 12px;
-        }}
-        .source-link {{
-            margin-top: 20px;
-            font-size: 14px;
-        }}
-        .source-link a {{
-            color: #c00;
-            text-decoration: none;
-        }}
-        .source-link a:hover {{
-            text-decoration: underline;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1 class="title">{article_info['title']}</h1>
-            <div class="meta">
-                <span>作者: {article_info['author']}</span>
-                <br>
-                <span>日期: {article_info['date']}</span>
-                <br>
-                <span>版面: {article_info['version']}</span>
-                <br>
-                <span>版面号: {article_info['version_number']}，文章序号: {article_info['article_number']}</span>
-            </div>
-        </div>
-        
-        <div class="content">
-            {article_info['content']}
-        </div>
-        
-        <div class="source-link">
-            <a href="{article_info['original_url']}" target="_blank">查看原文</a>
-        </div>
-        
-        <div class="footer">
-            <p>来源: 人民日报</p>
-            <p>处理时间: {now} (北京时间)</p>
-        </div>
-    </div>
-</body>
-</html>
-            """
+            now = datetime.now(SHANGHAI_TZ).strftime('%Y-%m-%d %H:%M:%S')
+            
+            html = _READABLE_HTML_TEMPLATE.substitute(
+                title=article_info['title'],
+                author=article_info['author'],
+                date=article_info['date'],
+                version=article_info['version'],
+                version_number=article_info['version_number'],
+                article_number=article_info['article_number'],
+                content=article_info['content'],
+                original_url=article_info['original_url'],
+                now=now
+            )
             
             self.logger.info("成功生成可读性更好的HTML内容")
             return html
@@ -388,19 +429,20 @@ class ArticleParser:
             self.logger.error(f"生成HTML时出错: {str(e)}")
             return ""
     
-    def generate_readable_html_from_content(self, article_content, original_url=""):
+    def generate_readable_html_from_content(self, article_content, original_url="", title=None):
         """
         直接从提取的文章内容生成可读性更好的HTML
         
         Args:
             article_content (str): 已提取的文章内容HTML
             original_url (str): 原始文章URL
+            title (str, optional): 提取时已得到的标题，提供时不再重新解析文章内容
             
         Returns:
             str: 生成的HTML内容
         """
         # 解析文章内容
-        article_info = self.parse_article_content(article_content, original_url)
+        article_info = self.parse_article_content(article_content, original_url, title)
         if not article_info:
             self.logger.error("文章内容解析失败")
             return None
@@ -435,13 +477,12 @@ class ArticleParser:
         
         # 保存文件
         try:
-            # 确保输出目录存在
+            # 确保输出目录存在（exist_ok已处理目录存在的情况，无需预先检查）
             output_dir = os.path.dirname(output_path)
-            if output_dir and not os.path.exists(output_dir):
+            if output_dir:
                 os.makedirs(output_dir, exist_ok=True)
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(readable_html)
+            write_file(output_path, readable_html)
             
             self.logger.info(f"文章已保存到: {output_path}")
             return True
@@ -1,13 +1,130 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import asyncio
 import requests
-import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from lxml import etree
+from lxml import html as lxml_html
+from urllib.parse import urljoin, urlsplit
+from functools import lru_cache
 import re
 
+# 预编译的URL匹配模式：版面ID、新闻ID、日期
+_NODE_RE = re.compile(r'node_(\d+)\.html')
+_NEWS_ID_RE = re.compile(r'c(\d+)\.html')
+_DATE_URL_RE = re.compile(r'/(\d{4})(\d{2})/(\d{2})/')
+
+@lru_cache(maxsize=32)
+def _base_origin(base_url):
+    """获取基础URL的 scheme://host 部分，供join_url拼接以/开头的路径"""
+    parts = urlsplit(base_url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+def join_url(base_url, href):
+    """拼接链接的绝对URL
+    
+    http(s)绝对地址原样返回，以/开头的路径直接拼接基础URL的scheme和主机，
+    其余链接交给urljoin处理。
+    
+    Args:
+        base_url (str): 基础URL
+        href (str): 链接地址
+        
+    Returns:
+        str: 绝对URL
+    """
+    if href.startswith(('http://', 'https://')):
+        return href
+    # //开头的是协议相对地址，含 ./ 或 ../ 的路径需要urljoin规范化
+    if (href.startswith('/') and not href.startswith('//') and '/.' not in href
+            and base_url.startswith(('http://', 'https://'))):
+        return _base_origin(base_url) + href
+    return urljoin(base_url, href)
+
+# 并发获取页面时每秒最多发起的请求数（所有并发槽位共享）
+# 与原先逐个请求间隔0.5秒的频率一致，避免给服务器造成压力
+REQUEST_RATE = 2
+
+class _AsyncRateLimiter:
+    """全局异步限速器
+    
+    按固定间隔依次放行请求，所有协程共享同一节奏；
+    等待只发生在请求开始之前，请求完成后不再额外休眠。
+    """
+    
+    def __init__(self, rate):
+        """初始化限速器
+        
+        Args:
+            rate (float): 每秒允许发起的请求数
+        """
+        self.interval = 1.0 / rate
+        self._next_time = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """等待直到允许发起下一个请求"""
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            wait = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+def _has_classes(*classes):
+    """生成匹配同时具有指定class的XPath条件"""
+    return " and ".join(f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')" for name in classes)
+
+# 版面页公共容器路径: body > div.main.w1000 > div.right.right-main
+_RIGHT_MAIN_PATH = f"//body/div[{_has_classes('main', 'w1000')}]/div[{_has_classes('right', 'right-main')}]"
+
+# 预编译的版面导航和新闻列表XPath（直接在lxml树上查询，省去BeautifulSoup包装开销）
+VERSION_NAV_XPATH = etree.XPath(f"{_RIGHT_MAIN_PATH}/div[{_has_classes('swiper-box')}]/div")
+NEWS_LIST_XPATH = etree.XPath(f"{_RIGHT_MAIN_PATH}/div[{_has_classes('news')}]/ul")
+LINK_XPATH = etree.XPath(".//a[@href]")
+# 链接文本节点，与BeautifulSoup的get_text一致，不含<script>/<style>/<template>中的文本
+LINK_TEXT_XPATH = etree.XPath("descendant::text()[not(ancestor::script or ancestor::style or ancestor::template)]")
+
+def _parse_document(html_content):
+    """解析完整的HTML文档，内容为空时返回None"""
+    if not html_content or not html_content.strip():
+        return None
+    try:
+        return lxml_html.document_fromstring(html_content)
+    except ValueError:
+        # 带XML编码声明的字符串需要以bytes形式解析
+        return lxml_html.document_fromstring(html_content.encode('utf-8'))
+
+def collect_links(html_content, container_xpath):
+    """解析HTML，收集第一个匹配容器中的链接
+    
+    Args:
+        html_content (str): HTML内容
+        container_xpath (etree.XPath): 容器XPath，如VERSION_NAV_XPATH或NEWS_LIST_XPATH
+    
+    Returns:
+        list: [(href, 链接文本), ...]，链接文本等价于BeautifulSoup的get_text(strip=True)；未找到容器时返回None
+    """
+    tree = _parse_document(html_content)
+    containers = container_xpath(tree) if tree is not None else []
+    if not containers:
+        return None
+    return [(link.get('href'), "".join(text.strip() for text in LINK_TEXT_XPATH(link)))
+            for link in LINK_XPATH(containers[0])]
+
+logger = logging.getLogger("PeoplesDailyFetcher")
+
+# 配置日志记录器（模块导入时执行一次）
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
 class PeoplesDailyFetcher:
     """人民日报网页获取模块
     
@@ -28,15 +145,23 @@ class PeoplesDailyFetcher:
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
             'Connection': 'keep-alive'
         }
+        # 请求头只在会话上设置一次，后续请求无需逐次传入
+        self.session.headers.update(self.headers)
         
-        # 配置日志记录器
-        self.logger = logging.getLogger("PeoplesDailyFetcher")
-        if not self.logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
-            self.logger.setLevel(logging.INFO)
+        # 连接池容量覆盖并发获取版面时的请求数，并对服务端临时错误自动重试
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504])
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # 本次运行中已获取的页面内容缓存（URL -> HTML），同一URL重复出现时不再重新请求
+        self._content_cache = {}
+        
+        # 使用模块级日志记录器
+        self.logger = logger
     
     def get_latest_edition(self):
         """获取最新一期报纸的首页内容
@@ -46,11 +171,11 @@ class PeoplesDailyFetcher:
         """
         self.logger.info(f"获取最新一期报纸首页: {self.base_url}")
         try:
-            response = self.session.get(self.base_url, headers=self.headers, allow_redirects=True)
+            response = self.session.get(self.base_url, allow_redirects=True)
             response.raise_for_status()
-            response.encoding = 'utf-8'
             self.logger.info(f"成功获取最新一期，URL: {response.url}")
-            return response.url, response.text
+            # 页面固定为UTF-8编码，直接解码字节内容，跳过requests的编码探测
+            return response.url, response.content.decode('utf-8', 'replace')
         except requests.exceptions.RequestException as e:
             self.logger.error(f"获取最新一期失败: {str(e)}")
             return None, None
@@ -71,11 +196,11 @@ class PeoplesDailyFetcher:
         self.logger.info(f"获取指定日期版面: {date_url}")
         
         try:
-            response = self.session.get(date_url, headers=self.headers)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
-            self.logger.info(f"成功获取指定日期版面: {date_url}")
-            return date_url, response.text
+            # 以流式方式请求，状态码异常（如当天无报纸）时不再下载响应体
+            with self.session.get(date_url, stream=True) as response:
+                response.raise_for_status()
+                self.logger.info(f"成功获取指定日期版面: {date_url}")
+                return date_url, response.content.decode('utf-8', 'replace')
         except requests.exceptions.RequestException as e:
             self.logger.error(f"获取指定日期版面失败: {date_url}, 错误: {str(e)}")
             return None, None
@@ -91,20 +216,18 @@ class PeoplesDailyFetcher:
             list: 版面信息列表 [{'title': '版面标题', 'url': '版面URL', 'version_id': 版面ID}, ...]
         """
         self.logger.info("提取报纸版面链接")
-        soup = BeautifulSoup(html_content, 'html.parser')
+        links = collect_links(html_content, VERSION_NAV_XPATH)
         versions = []
         
         # 版面导航元素
-        swiper = soup.select_one("body > div.main.w1000 > div.right.right-main > div.swiper-box > div")
-        if swiper:
-            links = swiper.find_all('a', href=True)
-            for link in links:
+        if links is not None:
+            for href, title in links:
                 # 提取版面ID
-                version_id = self._extract_version_id(link['href'])
+                version_id = self._extract_version_id(href)
                 # 构建完整URL
-                full_url = urljoin(base_url, link['href'])
+                full_url = join_url(base_url, href)
                 versions.append({
-                    'title': link.get_text(strip=True),
+                    'title': title,
                     'url': full_url,
                     'version_id': version_id
                 })
@@ -140,23 +263,17 @@ class PeoplesDailyFetcher:
         versions = self.extract_versions(main_html, base_url)
         results = []
         
-        # 获取每个版面的内容
-        for version in versions:
-            self.logger.info(f"获取版面: {version['title']} - {version['url']}")
-            try:
-                response = self.session.get(version['url'], headers=self.headers)
-                response.raise_for_status()
-                response.encoding = 'utf-8'
-                results.append({
-                    'version_info': version,
-                    'html_content': response.text
-                })
-                self.logger.info(f"成功获取版面: {version['title']}")
-            except requests.exceptions.RequestException as e:
-                self.logger.error(f"获取版面失败: {version['title']}, 错误: {str(e)}")
-            
-            # 控制请求速率，避免给服务器造成压力
-            time.sleep(0.5)
+        # 并发获取每个版面的内容
+        pages = self.fetch_pages([version['url'] for version in versions])
+        for version, html_content in zip(versions, pages):
+            if html_content is None:
+                self.logger.error(f"获取版面失败: {version['title']}")
+                continue
+            results.append({
+                'version_info': version,
+                'html_content': html_content
+            })
+            self.logger.info(f"成功获取版面: {version['title']}")
         
         self.logger.info(f"共获取 {len(results)}/{len(versions)} 个版面内容")
         return results
@@ -172,17 +289,14 @@ class PeoplesDailyFetcher:
             list: 新闻列表 [{'title': '新闻标题', 'url': '新闻URL', 'news_id': '新闻ID'}, ...]
         """
         self.logger.info("提取版面新闻列表")
-        soup = BeautifulSoup(html_content, 'html.parser')
+        news_links = collect_links(html_content, NEWS_LIST_XPATH)
         news_items = []
         
         # 寻找新闻列表元素
-        news_list = soup.select_one("body > div.main.w1000 > div.right.right-main > div.news > ul")
-        if news_list:
-            news_links = news_list.find_all('a', href=True)
-            for link in news_links:
-                news_url = urljoin(base_url, link['href'])
-                news_id = self._extract_news_id(link['href'])
-                news_title = link.get_text(strip=True)
+        if news_links is not None:
+            for href, news_title in news_links:
+                news_url = join_url(base_url, href)
+                news_id = self._extract_news_id(href)
                 
                 news_items.append({
                     'title': news_title,
@@ -205,17 +319,64 @@ class PeoplesDailyFetcher:
         Returns:
             str: 新闻详情页HTML内容，获取失败则返回None
         """
+        cached = self._content_cache.get(news_url)
+        if cached is not None:
+            self.logger.info(f"使用已缓存的新闻内容: {news_url}")
+            return cached
+        
         self.logger.info(f"获取新闻内容: {news_url}")
         try:
-            response = self.session.get(news_url, headers=self.headers)
+            response = self.session.get(news_url)
             response.raise_for_status()
-            response.encoding = 'utf-8'
             self.logger.info(f"成功获取新闻内容: {news_url}")
-            return response.text
+            html_content = response.content.decode('utf-8', 'replace')
+            # 只缓存成功获取的内容，失败的URL下次仍会重新请求
+            self._content_cache[news_url] = html_content
+            return html_content
         except requests.exceptions.RequestException as e:
             self.logger.error(f"获取新闻内容失败: {news_url}, 错误: {str(e)}")
             return None
     
+    async def afetch_pages(self, urls, max_concurrency=8, rate=REQUEST_RATE):
+        """并发获取多个页面内容
+        
+        每个页面在线程中通过get_news_content获取，同时进行的请求数不超过max_concurrency；
+        所有请求共享一个全局限速器，每秒发起的请求数不超过rate，避免给服务器造成压力。
+        
+        Args:
+            urls (list): 页面URL列表
+            max_concurrency (int): 同时进行的最大请求数
+            rate (float): 每秒最多发起的请求数
+        
+        Returns:
+            list: 与urls顺序对应的HTML内容列表，获取失败的位置为None
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        limiter = _AsyncRateLimiter(rate)
+        
+        async def _fetch(url):
+            async with semaphore:
+                # 控制请求速率
+                await limiter.acquire()
+                return await asyncio.to_thread(self.get_news_content, url)
+        
+        return await asyncio.gather(*[_fetch(url) for url in urls])
+    
+    def fetch_pages(self, urls, max_concurrency=8, rate=REQUEST_RATE):
+        """并发获取多个页面内容（同步接口）
+        
+        Args:
+            urls (list): 页面URL列表
+            max_concurrency (int): 同时进行的最大请求数
+            rate (float): 每秒最多发起的请求数
+        
+        Returns:
+            list: 与urls顺序对应的HTML内容列表，获取失败的位置为None
+        """
+        if not urls:
+            return []
+        return asyncio.run(self.afetch_pages(urls, max_concurrency, rate))
+    
     def _extract_version_id(self, url):
         """从URL中提取版面ID
         
@@ -225,7 +386,15 @@ class PeoplesDailyFetcher:
         Returns:
             int: 版面ID
         """
-        match = re.search(r'node_(\d+)\.html', url)
+        # 快速路径：版面URL中包含node_NN.html，直接切片取出数字
+        start = url.find('node_')
+        if start >= 0:
+            end = url.find('.html', start + 5)
+            digits = url[start + 5:end]
+            if end > 0 and digits.isdecimal():
+                return int(digits)
+        
+        match = _NODE_RE.search(url)
         if match:
             return int(match.group(1))
         return 0
@@ -239,7 +408,15 @@ class PeoplesDailyFetcher:
         Returns:
             str: 新闻ID
         """
-        match = re.search(r'c(\d+)\.html', url)
+        # 快速路径：新闻URL中包含cNNN.html，直接切片取出数字
+        end = url.find('.html')
+        if end > 0:
+            start = url.rfind('c', 0, end)
+            digits = url[start + 1:end]
+            if start >= 0 and digits.isdecimal():
+                return digits
+        
+        match = _NEWS_ID_RE.search(url)
         if match:
             return match.group(1)
         return ''
@@ -253,7 +430,7 @@ class PeoplesDailyFetcher:
         Returns:
             tuple: (年, 月, 日) 元组，提取失败则返回None
         """
-        match = re.search(r'/(\d{4})(\d{2})/(\d{2})/', url)
+        match = _DATE_URL_RE.search(url)
         if match:
             year = int(match.group(1))
             month = int(match.group(2))
@@ -2,18 +2,18 @@
 # -*- coding: utf-8 -*-
 
 import os
-import time
 import re
 import sys
 import logging
 import argparse
 from datetime import datetime
 from urllib.parse import urljoin
-import pytz  # 添加pytz库导入
+from zoneinfo import ZoneInfo
 
 # 导入自定义模块
 from crawler.fetcher import PeoplesDailyFetcher
 from crawler.parser import PeoplesDailyParser
+from utils.file_utils import write_file
 
 # 配置日志
 logging.basicConfig(
@@ -24,6 +24,9 @@ logging.basicConfig(
     ]
 )
 
+# 北京时区，模块加载时解析一次
+SHANGHAI_TZ = ZoneInfo('Asia/Shanghai')
+
 logger = logging.getLogger("CrawlerMain")
 
 class PeoplesDailyCrawler:
@@ -42,7 +45,7 @@ class PeoplesDailyCrawler:
         # 设置默认目标URL
         if target_url is None:
             # 使用当天日期构造URL（使用中国时区）
-            today = datetime.now(pytz.timezone('Asia/Shanghai'))
+            today = datetime.now(SHANGHAI_TZ)
             target_url = f"http://paper.people.com.cn/rmrb/pc/layout/{today.strftime('%Y%m')}/{today.strftime('%d')}/node_01.html"
         
         self.target_url = target_url
@@ -65,21 +68,20 @@ class PeoplesDailyCrawler:
             self.date_string = date_match.group(1) + date_match.group(2)
         else:
             # 使用中国时区的当前日期
-            self.date_string = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y%m%d')
+            self.date_string = datetime.now(SHANGHAI_TZ).strftime('%Y%m%d')
     
     def save_to_file(self, content, filename):
         """保存内容到文件
         
         Args:
-            content (str): 文件内容
+            content (str|bytes): 文件内容，bytes将直接写入
             filename (str): 文件名
             
         Returns:
             str: 保存的文件路径
         """
         filepath = os.path.join(self.output_dir, filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        write_file(filepath, content)
         logger.info(f"已保存到: {filepath}")
         return filepath
     
@@ -124,12 +126,10 @@ class PeoplesDailyCrawler:
         # 3. 提取每个版面的新闻
         all_versions_data = []
         
-        for version in versions:
-            # 控制请求速率
-            time.sleep(0.5)
-            
-            # 获取版面内容
-            version_html = self.fetcher.get_news_content(version['url'])
+        # 并发获取所有版面内容
+        version_pages = self.fetcher.fetch_pages([version['url'] for version in versions])
+        
+        for version, version_html in zip(versions, version_pages):
             if not version_html:
                 logger.warning(f"获取版面 {version['title']} 失败，跳过")
                 continue
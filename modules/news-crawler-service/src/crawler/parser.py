@@ -1,12 +1,52 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from bs4 import BeautifulSoup, Tag
+from html import escape
 import re
 from datetime import datetime
 import logging
-import pytz  # 添加pytz库导入
+from zoneinfo import ZoneInfo
+
+# 版面页直接用lxml解析，复用获取模块中预编译的版面导航和新闻列表XPath
+from .fetcher import collect_links, join_url, VERSION_NAV_XPATH, NEWS_LIST_XPATH
+
+# 北京时区，模块加载时解析一次
+SHANGHAI_TZ = ZoneInfo('Asia/Shanghai')
+
+# 预编译的正则表达式：版面ID、新闻ID、页面中的版面日期以及日期文本的多种格式
+_NODE_RE = re.compile(r'node_(\d+)\.html')
+_NEWS_ID_RE = re.compile(r'c(\d+)\.html')
+_LAYOUT_DATE_RE = re.compile(r'layout/(\d{6})/(\d{2})/')
+_DATE_PATTERNS = (
+    re.compile(r'(\d{4})年(\d{1,2})月(\d{1,2})日'),
+    re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})'),
+)
+
+# 新闻详情页的标题标签和正文容器class
+_TITLE_TAGS = frozenset(('h1', 'h2', 'h3'))
+_CONTENT_CLASSES = frozenset(('article', 'article-content', 'content'))
+
+# HTML报告中每个版面标题和新闻条目的模板，填入的标题和链接均已转义
+_VERSION_HEADER_TEMPLATE = """
+            <div class="version">
+                <h2 class="version-title"><a href="{}" target="_blank">{}</a></h2>
+                <ul class="news-list">
+"""
+_NEWS_ITEM_TEMPLATE = """
+                    <li class="news-item">
+                        <a href="{}" class="news-link" target="_blank">{}</a>
+                    </li>
+"""
+
+logger = logging.getLogger("PeoplesDailyParser")
+
+# 配置日志记录器（模块导入时执行一次）
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
 
 class PeoplesDailyParser:
     """人民日报HTML解析模块
@@ -16,14 +56,8 @@ class PeoplesDailyParser:
     
     def __init__(self):
         """初始化解析器"""
-        # 配置日志记录器
-        self.logger = logging.getLogger("PeoplesDailyParser")
-        if not self.logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
-            self.logger.setLevel(logging.INFO)
+        # 使用模块级日志记录器
+        self.logger = logger
     
     def extract_versions(self, html_content, base_url):
         """提取报纸版面链接列表
@@ -36,20 +70,18 @@ class PeoplesDailyParser:
             list: 版面信息列表 [{'title': '版面标题', 'url': '版面URL', 'version_id': 版面ID}, ...]
         """
         self.logger.info("提取报纸版面链接")
-        soup = BeautifulSoup(html_content, 'html.parser')
+        links = collect_links(html_content, VERSION_NAV_XPATH)
         versions = []
         
         # 版面导航元素
-        swiper = soup.select_one("body > div.main.w1000 > div.right.right-main > div.swiper-box > div")
-        if swiper:
-            links = swiper.find_all('a', href=True)
-            for link in links:
+        if links is not None:
+            for href, title in links:
                 # 提取版面ID
-                version_id = self._extract_version_id(link['href'])
+                version_id = self._extract_version_id(href)
                 # 构建完整URL
-                full_url = urljoin(base_url, link['href'])
+                full_url = join_url(base_url, href)
                 versions.append({
-                    'title': link.get_text(strip=True),
+                    'title': title,
                     'url': full_url,
                     'version_id': version_id
                 })
@@ -71,30 +103,26 @@ class PeoplesDailyParser:
             list: 新闻列表 [{'title': '新闻标题', 'url': '新闻URL', 'news_id': '新闻ID'}, ...]
         """
         self.logger.info("提取版面新闻列表")
-        soup = BeautifulSoup(html_content, 'html.parser')
+        news_links = collect_links(html_content, NEWS_LIST_XPATH)
         news_items = []
         
         # 新闻列表元素
-        news_list = soup.select_one("body > div.main.w1000 > div.right.right-main > div.news > ul")
-        if news_list:
-            news_links = news_list.find_all('a', href=True)
-            for link in news_links:
+        if news_links is not None:
+            for href, news_title in news_links:
                 # 提取新闻原始链接
-                href = link['href']
-                self.logger.debug(f"原始链接: {href}")
+                self.logger.debug("原始链接: %s", href)
                 
                 # 如果是相对链接，转换为绝对链接
-                news_url = urljoin(base_url, href)
+                news_url = join_url(base_url, href)
                 
                 # 如果链接是content类型，需要进行转换
                 if '/content/' in news_url:
-                    self.logger.debug(f"检测到content类型链接: {news_url}")
+                    self.logger.debug("检测到content类型链接: %s", news_url)
                     # 使用原始链接，无需修改
                 else:
-                    self.logger.debug(f"使用原始相对链接构建URL: {news_url}")
+                    self.logger.debug("使用原始相对链接构建URL: %s", news_url)
                 
                 news_id = self._extract_news_id(href)
-                news_title = link.get_text(strip=True)
                 
                 news_items.append({
                     'title': news_title,
@@ -108,22 +136,33 @@ class PeoplesDailyParser:
         
         return news_items
     
-    def extract_news_content(self, html_content):
+    def parse_page(self, html_content):
+        """解析新闻详情页，返回可供多个extract_*方法共用的文档树
+        
+        Args:
+            html_content (str): 新闻详情页HTML内容
+            
+        Returns:
+            BeautifulSoup: 解析后的文档树
+        """
+        return BeautifulSoup(html_content, 'html.parser')
+    
+    def extract_news_content(self, html_content, soup=None):
         """提取新闻详情内容
         
         Args:
             html_content (str): 新闻详情页HTML内容
+            soup (BeautifulSoup, optional): 已解析的文档树，提供时不再重复解析HTML
             
         Returns:
             dict: 新闻内容 {'title': '标题', 'content': '正文内容', 'publish_date': '发布日期', 'source': '来源'}
         """
         self.logger.info("提取新闻详情内容")
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if soup is None:
+            soup = self.parse_page(html_content)
         
-        # 新闻标题通常在h1或h2标签中
-        title_element = soup.find(['h1', 'h2', 'h3'])
-        # 内容通常在特定class的div中
-        content_element = soup.find('div', class_=['article', 'article-content', 'content'])
+        # 新闻标题通常在h1或h2标签中，内容通常在特定class的div中
+        title_element, content_element = self._find_title_and_content(soup)
         
         # 尝试提取发布日期
         publish_date = self._extract_date(soup, html_content)
@@ -138,17 +177,19 @@ class PeoplesDailyParser:
         self.logger.info(f"成功提取新闻内容: {result['title']}")
         return result
     
-    def extract_keywords(self, html_content):
+    def extract_keywords(self, html_content, soup=None):
         """从新闻内容中提取关键词
         
         Args:
             html_content (str): 新闻详情页HTML内容
+            soup (BeautifulSoup, optional): 已解析的文档树，提供时不再重复解析HTML
             
         Returns:
             list: 关键词列表
         """
         self.logger.info("提取新闻关键词")
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if soup is None:
+            soup = self.parse_page(html_content)
         keywords = []
         
         # 查找meta标签中的keywords
@@ -168,6 +209,30 @@ class PeoplesDailyParser:
         self.logger.info(f"提取到 {len(keywords)} 个关键词")
         return keywords
     
+    def _find_title_and_content(self, soup):
+        """一次遍历文档树，同时查找第一个标题元素和第一个正文容器
+        
+        等价于分别调用soup.find(['h1', 'h2', 'h3'])和
+        soup.find('div', class_=['article', 'article-content', 'content'])，两者都找到后即停止遍历。
+        
+        Args:
+            soup (BeautifulSoup): BeautifulSoup对象
+            
+        Returns:
+            tuple: (标题元素, 正文容器元素)，未找到的位置为None
+        """
+        title_element = content_element = None
+        for element in soup.descendants:
+            if not isinstance(element, Tag):
+                continue
+            if title_element is None and element.name in _TITLE_TAGS:
+                title_element = element
+            if content_element is None and element.name == 'div' and not _CONTENT_CLASSES.isdisjoint(element.get('class') or ()):
+                content_element = element
+            if title_element is not None and content_element is not None:
+                break
+        return title_element, content_element
+    
     def _extract_version_id(self, url):
         """从URL中提取版面ID
         
@@ -177,7 +242,7 @@ class PeoplesDailyParser:
         Returns:
             int: 版面ID
         """
-        match = re.search(r'node_(\d+)\.html', url)
+        match = _NODE_RE.search(url)
         if match:
             return int(match.group(1))
         return 0
@@ -191,7 +256,7 @@ class PeoplesDailyParser:
         Returns:
             str: 新闻ID
         """
-        match = re.search(r'c(\d+)\.html', url)
+        match = _NEWS_ID_RE.search(url)
         if match:
             return match.group(1)
         return ''
@@ -207,7 +272,7 @@ class PeoplesDailyParser:
             str: 日期字符串，格式为YYYY-MM-DD
         """
         # 方法1：从URL中提取
-        match = re.search(r'layout/(\d{6})/(\d{2})/', html_content)
+        match = _LAYOUT_DATE_RE.search(html_content)
         if match:
             year_month = match.group(1)
             day = match.group(2)
@@ -218,15 +283,14 @@ class PeoplesDailyParser:
         if date_element:
             date_text = date_element.get_text(strip=True)
             # 尝试解析多种日期格式
-            for pattern in [r'(\d{4})年(\d{1,2})月(\d{1,2})日', r'(\d{4})-(\d{1,2})-(\d{1,2})']: 
-                date_match = re.search(pattern, date_text)
+            for pattern in _DATE_PATTERNS:
+                date_match = pattern.search(date_text)
                 if date_match:
                     y, m, d = date_match.groups()
                     return f"{y}-{int(m):02d}-{int(d):02d}"
         
         # 默认使用当天中国日期
-        china_tz = pytz.timezone('Asia/Shanghai')
-        return datetime.now(china_tz).strftime('%Y-%m-%d')
+        return datetime.now(SHANGHAI_TZ).strftime('%Y-%m-%d')
     
     def generate_html_report(self, versions_data, date_string):
         """生成HTML报告
@@ -243,7 +307,8 @@ class PeoplesDailyParser:
         # 格式化日期显示
         display_date = f"{date_string[:4]}年{date_string[4:6]}月{date_string[6:8]}日"
         
-        html_content = f"""
+        # 各片段先收集到列表中，最后统一拼接
+        parts = [f"""
 <!DOCTYPE html>
 <html>
 <head>
@@ -271,45 +336,40 @@ class PeoplesDailyParser:
         </div>
         
         <div class="content">
-"""
+"""]
+        append = parts.append
+        
+        # 构造各版面页面的链接，使用版面序号来构建URL，确保从01开始编号
+        layout_prefix = f"http://paper.people.com.cn/rmrb/pc/layout/{date_string[:6]}/{date_string[6:8]}/node_"
+        version_urls = [f"{layout_prefix}{i:02d}.html" for i in range(1, len(versions_data) + 1)]
         
         # 添加各版面内容
-        for i, version in enumerate(versions_data, 1):
-            # 构造版面页面的链接
-            # 使用版面序号来构建URL，确保从01开始编号
-            version_url = f"http://paper.people.com.cn/rmrb/pc/layout/{date_string[:6]}/{date_string[6:8]}/node_{i:02d}.html"
+        for version_url, version in zip(version_urls, versions_data):
+            append(_VERSION_HEADER_TEMPLATE.format(version_url, escape(version['title'])))
             
-            html_content += f"""
-            <div class="version">
-                <h2 class="version-title"><a href="{version_url}" target="_blank">{version['title']}</a></h2>
-                <ul class="news-list">
-"""
-            
-            # 添加当前版面的新闻列表
-            for news in version['news']:
-                html_content += f"""
-                    <li class="news-item">
-                        <a href="{news['url']}" class="news-link" target="_blank">{news['title']}</a>
-                    </li>
-"""
+            # 添加当前版面的新闻列表（标题和链接转义后再写入HTML）
+            parts.extend(_NEWS_ITEM_TEMPLATE.format(escape(news['url']), escape(news['title']))
+                         for news in version['news'])
             
-            html_content += """
+            append("""
                 </ul>
             </div>
-"""
+""")
         
         # 添加页脚
-        html_content += f"""
+        append(f"""
         </div>
         
         <div class="footer">
             <p>数据来源: 人民日报 - http://paper.people.com.cn</p>
-            <p>爬取时间: {datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')} (北京时间)</p>
+            <p>爬取时间: {datetime.now(SHANGHAI_TZ).strftime('%Y-%m-%d %H:%M:%S')} (北京时间)</p>
         </div>
     </div>
 </body>
 </html>
-"""
+""")
+        
+        html_content = "".join(parts)
         
         self.logger.info("HTML报告生成成功")
         return html_content 
\ No newline at end of file
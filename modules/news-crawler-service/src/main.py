@@ -6,7 +6,7 @@ import sys
 import logging
 import argparse
 from datetime import datetime
-import pytz  # 添加pytz库导入
+from zoneinfo import ZoneInfo
 
 # 导入自定义模块
 from crawler.main import crawl_peoples_daily
@@ -21,6 +21,9 @@ logging.basicConfig(
     ]
 )
 
+# 北京时区，模块加载时解析一次
+SHANGHAI_TZ = ZoneInfo('Asia/Shanghai')
+
 logger = logging.getLogger("NewsAggregatorMain")
 
 def process_news(date=None, output_dir=None):
@@ -39,7 +42,7 @@ def process_news(date=None, output_dir=None):
         os.makedirs(output_dir, exist_ok=True)
     
     # 使用北京时间
-    china_time = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+    china_time = datetime.now(SHANGHAI_TZ).strftime('%Y-%m-%d %H:%M:%S')
     logger.info(f"开始处理新闻数据流程 (北京时间: {china_time})")
     
     # 1. 爬取数据
@@ -66,7 +69,7 @@ def process_news(date=None, output_dir=None):
     convert_to_markdown(input_data, md_output_path)
     
     # 完成时使用北京时间
-    china_time = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+    china_time = datetime.now(SHANGHAI_TZ).strftime('%Y-%m-%d %H:%M:%S')
     logger.info(f"数据处理完成 (北京时间: {china_time})")
     return True
 
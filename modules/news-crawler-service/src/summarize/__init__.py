@@ -9,6 +9,11 @@
 
 __version__ = '0.1.0'
 
-from src.summarize.main import run_summarize
+__all__ = ['run_summarize']
 
-__all__ = ['run_summarize'] 
\ No newline at end of file
+def __getattr__(name):
+    """按需导入run_summarize，仅读取版本号时不加载requests等依赖"""
+    if name == 'run_summarize':
+        from src.summarize.main import run_summarize
+        return run_summarize
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}") 
\ No newline at end of file
@@ -2,41 +2,191 @@
 # -*- coding: utf-8 -*-
 
 import os
+import asyncio
+import hashlib
+import tempfile
+import importlib.util
 import logging
 import json
 from datetime import datetime
-import pytz
+from concurrent.futures import ThreadPoolExecutor
+from zoneinfo import ZoneInfo
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 import argparse
 import sys
 
-# 导入Token计数器
+# 导入Token计数器和frontmatter解析函数
 from src.summarize.token_counter import TokenCounter
+from src.summarize.file_processor import read_frontmatter_file
 
-# 尝试导入OpenAI模块，如果不存在则使用替代方案
+# 优先使用orjson处理JSON（更快），未安装时回退到标准库json
 try:
-    from openai import OpenAI
-    has_openai = True
+    import orjson
+    has_orjson = True
 except ImportError:
-    has_openai = False
+    has_orjson = False
+
+# 检查OpenAI模块是否可用，实际导入推迟到需要创建API客户端时，模拟模式下不加载SDK
+has_openai = importlib.util.find_spec("openai") is not None
+if not has_openai:
     logging.warning("未安装openai模块，将使用requests替代。建议运行 'pip install openai' 安装更稳定的官方SDK。")
 
+# 北京时区，模块加载时解析一次
+SHANGHAI_TZ = ZoneInfo('Asia/Shanghai')
+
 logger = logging.getLogger("AISummarizer")
 
+# 预编译的中文日期模式，例如2025年5月11日
+_CN_DATE_RE = re.compile(r'\d{4}年\d{1,2}月\d{1,2}日')
+
+# 元数据缺少标题时使用的默认标题
+UNKNOWN_TITLE = '未知标题'
+
+# 预编译的新闻链接行模式：以"- ["开头的行，取行内第一个[标题](链接)，group(0)为整行
+_NEWS_LINK_LINE_RE = re.compile(r'^- (?=\[)[^\n]*?\[(.*?)\]\((.*?)\)[^\n]*', re.M)
+
+# 指定总结结果缓存目录的环境变量，相同请求内容不再重复调用API
+SUMMARY_CACHE_DIR_ENV = "NEWS_SUMMARY_CACHE_DIR"
+
+# API请求超时时间（秒）：(连接超时, 读取超时)，连接失败时尽快重试，生成总结允许较长时间
+API_TIMEOUT = (5, 60)
+
+# 总结请求使用的系统提示词
+_SYSTEM_PROMPT = "你是一个专业的新闻摘要助手，擅长提取新闻文章的关键信息，并按照模板生成简洁明了的总结。"
+
+# 总结输出模板，单篇和合并总结的提示词共用
+_SUMMARY_FORMAT = (
+    "---\n"
+    "- 时间：\n"
+    "- 地点：\n"
+    "- 人物：\n"
+    "- 事件：\n"
+    "- 起因：\n"
+    "- 结果：\n"
+    "---\n"
+)
+
+# 单篇总结提示词：文章内容前后的固定部分
+_PROMPT_HEAD = "\n[文章内容]\n"
+_PROMPT_TAIL = (
+    "\n```\n"
+    "帮我总结以上新闻内容，字数控制在200左右，结果以以下模板输出：\n"
+    + _SUMMARY_FORMAT +
+    "直接输出结果，不要有任何多余的内容。\n"
+)
+
+# 合并总结提示词：开头说明（{count}为文章篇数）和每篇文章的模板
+_PACKED_PROMPT_HEAD = (
+    "请对下列{count}篇新闻逐篇总结，每篇字数控制在200左右，每篇总结以以下模板输出：\n"
+    + _SUMMARY_FORMAT +
+    "以JSON格式输出，格式为 {{\"summaries\": [{{\"index\": 文章编号, \"summary\": \"该篇按模板输出的总结\"}}]}}，不要有任何多余的内容。\n"
+)
+_PACKED_ARTICLE_TEMPLATE = "\n### {number}\n[文章内容]\n{content}\n"
+
+# 总结文件的YAML头模板
+_FRONT_MATTER_TEMPLATE = (
+    "---\n"
+    "title: \"AI总结: {title}\"\n"
+    "original_title: \"{title}\"\n"
+    "date: {date}\n"
+    "source: {source}\n"
+    "sidebar: false\n"
+    "summarized_at: {summarized_at}\n"
+)
+_TOKENS_TEMPLATE = (
+    "input_tokens: {input}\n"
+    "output_chars: {output}\n"
+    "estimated_cost: ${cost:.6f}\n"
+)
+
+# 模拟模式下的总结模板
+_MOCK_SUMMARY_TEMPLATE = (
+    "时间：{time}\n"
+    "地点：模拟地点\n"
+    "人物：模拟人物\n"
+    "事件：{title}\n"
+    "起因：这是一个模拟总结，由于未提供API密钥，系统生成了这个示例。\n"
+    "结果：为了完整展示功能，系统提供了这个模板化的总结。实际使用时，请提供有效的DeepSeek API密钥。"
+)
+
+def _write_file_atomic(path, data):
+    """原子地写入文件：先写入同目录下的临时文件再替换目标文件
+    
+    并发写入或中途失败时不会留下不完整的文件。
+    
+    Args:
+        path (str): 目标文件路径
+        data (bytes): 要写入的内容
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # mkstemp创建的文件权限为0600，改为普通文件的0644
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def default_cache_dir():
+    """获取总结结果缓存的默认目录
+    
+    缓存不放在输出目录下，避免随输出文件一起提交到仓库。
+    优先使用NEWS_SUMMARY_CACHE_DIR环境变量，其次为$XDG_CACHE_HOME/news-aggregator/summary，
+    都未设置时为~/.cache/news-aggregator/summary。
+    
+    Returns:
+        str: 缓存目录路径
+    """
+    cache_dir = os.environ.get(SUMMARY_CACHE_DIR_ENV)
+    if cache_dir:
+        return cache_dir
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'news-aggregator', 'summary')
+
+def _parse_usage(usage):
+    """将API返回的token用量整理为统一格式
+    
+    Args:
+        usage: API响应中的usage字段（字典或OpenAI SDK对象），可为None
+        
+    Returns:
+        dict: {'prompt_tokens', 'completion_tokens', 'cached_tokens'}，没有用量信息时返回None
+    """
+    if not usage:
+        return None
+    if not isinstance(usage, dict):
+        usage = usage.model_dump() if hasattr(usage, 'model_dump') else vars(usage)
+    # DeepSeek返回prompt_cache_hit_tokens，OpenAI兼容格式为prompt_tokens_details.cached_tokens
+    cached_tokens = usage.get('prompt_cache_hit_tokens')
+    if cached_tokens is None:
+        cached_tokens = (usage.get('prompt_tokens_details') or {}).get('cached_tokens')
+    return {
+        'prompt_tokens': usage.get('prompt_tokens') or 0,
+        'completion_tokens': usage.get('completion_tokens') or 0,
+        'cached_tokens': cached_tokens or 0
+    }
+
 class AISummarizer:
     """AI内容总结器
     
     使用DeepSeek API对内容进行总结
     """
     
-    def __init__(self, api_key=None, output_dir=None, use_mock=False):
+    def __init__(self, api_key=None, output_dir=None, use_mock=False, use_cache=True, cache_dir=None):
         """初始化AI总结器
         
         Args:
             api_key (str, optional): DeepSeek API密钥，如未提供则尝试从环境变量获取
             output_dir (str, optional): 输出目录路径，默认为src/output
             use_mock (bool, optional): 是否使用模拟模式，在没有API密钥的情况下返回模拟结果
+            use_cache (bool, optional): 是否使用总结结果缓存，相同请求内容不再重复调用API
+            cache_dir (str, optional): 总结结果缓存目录，默认见default_cache_dir()
         """
         # 设置API密钥
         self.api_key = api_key
@@ -48,14 +198,41 @@ class AISummarizer:
         
         # 设置模拟模式
         self.use_mock = use_mock or not self.api_key
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir or default_cache_dir()
                 
-        # 设置API客户端
+        # 设置API客户端（模拟模式下不会调用API，无需创建）
         self.has_openai = has_openai
-        if self.has_openai and self.api_key:
-            self.client = OpenAI(
-                api_key=self.api_key,
-                base_url="https://api.deepseek.com"
+        if self.has_openai and not self.use_mock:
+            try:
+                from openai import OpenAI
+                self.client = OpenAI(
+                    api_key=self.api_key,
+                    base_url="https://api.deepseek.com"
+                )
+            except ImportError as e:
+                logger.warning(f"导入openai模块失败，将使用requests替代: {str(e)}")
+                self.has_openai = False
+        if not self.has_openai and not self.use_mock:
+            # 未安装openai时使用requests会话，多次调用复用同一连接，避免每次重新握手
+            self.session = requests.Session()
+            self.session.headers.update({
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {self.api_key}"
+            })
+            # 总结请求按次计费且不幂等，只在确定未被处理时自动重试：
+            # 连接失败（请求未发出）和429限流（按Retry-After等待），
+            # 读取超时和5xx错误可能已执行并计费，交给调用方处理
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=16,
+                max_retries=Retry(total=3, read=0, other=0, backoff_factor=0.3, status_forcelist=[429],
+                                  allowed_methods=frozenset(['POST']), respect_retry_after_header=True)
             )
+            self.session.mount('https://', adapter)
+        
+        # today-news.md中的链接行缓存，首次查找原文链接时读取
+        self._news_links = None
         
         # 创建Token计数器
         self.token_counter = TokenCounter()
@@ -95,14 +272,17 @@ class AISummarizer:
         try:
             logger.info("正在准备进行内容总结...")
             
-            # 准备提示词
-            prompt = self._generate_fixed_prompt(content_data)
+            # 准备提示词和消息
+            messages = self._build_messages(self._generate_fixed_prompt(content_data))
             
-            # 准备消息
-            messages = [
-                {"role": "system", "content": "你是一个专业的新闻摘要助手，擅长提取新闻文章的关键信息，并按照模板生成简洁明了的总结。"},
-                {"role": "user", "content": prompt}
-            ]
+            # 相同请求已有缓存的总结结果时直接返回，避免重复计费
+            cache_path = self._cache_path(messages) if self.use_cache and not self.use_mock else None
+            if cache_path:
+                cached = self._load_cached_summary(cache_path)
+                if cached:
+                    logger.info(f"使用缓存的总结内容: {cache_path}")
+                    cached['original_content'] = content_data
+                    return cached
             
             # 计算输入tokens
             input_tokens = self.token_counter.estimate_input_tokens(messages)
@@ -116,60 +296,38 @@ class AISummarizer:
             logger.info(f"估算API调用成本: ${estimated_cost:.6f}")
             
             # 如果是模拟模式，返回模拟结果
+            usage = None
             if self.use_mock:
                 logger.info("使用模拟模式，生成模拟总结内容")
                 summary = self._generate_mock_summary(content_data)
             else:
                 logger.info("正在调用DeepSeek API进行内容总结...")
-                # 调用API
-                if self.has_openai:
-                    # 使用OpenAI SDK
-                    response = self.client.chat.completions.create(
-                        model="deepseek-chat",  # 使用DeepSeek-V3模型
-                        messages=messages,
-                        temperature=0.3,  # 较低的温度使输出更加确定性
-                        stream=False
-                    )
-                    
-                    # 提取总结内容
-                    summary = response.choices[0].message.content
-                else:
-                    # 使用requests替代
-                    response = requests.post(
-                        "https://api.deepseek.com/chat/completions",
-                        headers={
-                            "Content-Type": "application/json",
-                            "Authorization": f"Bearer {self.api_key}"
-                        },
-                        json={
-                            "model": "deepseek-chat",
-                            "messages": messages,
-                            "temperature": 0.3,
-                            "stream": False
-                        }
-                    )
-                    
-                    # 检查响应
-                    response.raise_for_status()
-                    data = response.json()
-                    
-                    # 提取总结内容
-                    summary = data['choices'][0]['message']['content']
+                summary, usage = self._call_api(messages, stream=True)
             
             logger.info("内容总结完成")
-            logger.info(f"总结内容预览:\n{summary[:200]}...")
+            # 预览只在INFO级别输出时才截取和格式化
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("总结内容预览:\n%s...", summary[:200])
             
             # 准备结果
             result = {
                 'original_content': content_data,
                 'summary': summary,
-                'timestamp': datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S'),
+                'timestamp': datetime.now(SHANGHAI_TZ).strftime('%Y-%m-%d %H:%M:%S'),
                 'tokens': {
                     'input': input_tokens,
                     'output': len(summary),  # 实际输出字符数
                     'estimated_cost': estimated_cost
                 }
             }
+            if usage:
+                # API返回了实际用量时，以实际token数替换估算值
+                self._apply_usage(result['tokens'], usage)
+                logger.info(f"实际输入tokens: {usage['prompt_tokens']}（命中缓存: {usage['cached_tokens']}），"
+                            f"实际输出tokens: {usage['completion_tokens']}")
+            
+            if cache_path:
+                self._save_cached_summary(cache_path, result)
             
             return result
             
@@ -177,6 +335,382 @@ class AISummarizer:
             logger.error(f"内容总结出错: {str(e)}")
             return None
     
+    def _build_messages(self, prompt):
+        """构造发送给API的消息列表
+        
+        Args:
+            prompt (str): 用户提示词
+            
+        Returns:
+            list: 消息列表
+        """
+        return [
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def summarize_packed(self, content_list):
+        """在一次API调用中总结多篇内容
+        
+        多篇文章编号后合并为一个请求，要求模型以JSON返回每篇的总结，
+        系统提示词和请求开销由多篇文章分摊。已有缓存的文章不再发送，
+        合并结果中缺失的文章再单独调用summarize；模拟模式下逐篇处理。
+        
+        Args:
+            content_list (list): 内容数据字典列表
+            
+        Returns:
+            list: 与content_list顺序对应的总结结果列表，失败的位置为None
+        """
+        if self.use_mock or len(content_list) <= 1:
+            return [self.summarize(content_data) for content_data in content_list]
+        
+        results = [None] * len(content_list)
+        pending = []  # 需要调用API的文章: (位置, 内容数据, 缓存路径)
+        for i, content_data in enumerate(content_list):
+            if not content_data or 'content' not in content_data:
+                logger.error("内容数据无效，无法进行总结")
+                continue
+            # 与单篇总结使用相同的缓存键，两种方式的结果可以互相复用
+            cache_path = None
+            if self.use_cache:
+                cache_path = self._cache_path(self._build_messages(self._generate_fixed_prompt(content_data)))
+            cached = self._load_cached_summary(cache_path) if cache_path else None
+            if cached:
+                logger.info(f"使用缓存的总结内容: {cache_path}")
+                cached['original_content'] = content_data
+                results[i] = cached
+            else:
+                pending.append((i, content_data, cache_path))
+        
+        if not pending:
+            return results
+        
+        summaries = {}
+        count = len(pending)
+        input_tokens = 0
+        estimated_cost = 0
+        usage = None
+        try:
+            messages = self._build_messages(self._generate_packed_prompt([item[1] for item in pending]))
+            
+            # 估算本次合并请求的tokens和成本
+            input_tokens = self.token_counter.estimate_input_tokens(messages)
+            output_tokens = self.token_counter.estimate_output_tokens(200 * count)
+            estimated_cost = self.token_counter.estimate_cost(input_tokens, output_tokens)
+            logger.info(f"合并 {count} 篇内容进行总结，估算输入tokens: {input_tokens}，估算成本: ${estimated_cost:.6f}")
+            
+            response, usage = self._call_api(messages, response_format={"type": "json_object"})
+            data = orjson.loads(response) if has_orjson else json.loads(response)
+            for item in data.get('summaries', []):
+                summary = item.get('summary')
+                if isinstance(summary, str) and summary.strip():
+                    summaries[int(item['index'])] = summary.strip()
+            logger.info(f"合并总结完成，返回 {len(summaries)}/{count} 篇")
+        except Exception as e:
+            logger.error(f"合并总结出错: {str(e)}")
+        
+        timestamp = datetime.now(SHANGHAI_TZ).strftime('%Y-%m-%d %H:%M:%S')
+        for number, (i, content_data, cache_path) in enumerate(pending, 1):
+            summary = summaries.get(number)
+            if summary is None:
+                logger.warning(f"合并结果中缺少第 {number} 篇，单独进行总结")
+                results[i] = self.summarize(content_data)
+                continue
+            
+            # 合并请求的tokens和成本按篇数平均分摊
+            result = {
+                'original_content': content_data,
+                'summary': summary,
+                'timestamp': timestamp,
+                'tokens': {
+                    'input': input_tokens // count,
+                    'output': len(summary),
+                    'estimated_cost': estimated_cost / count
+                }
+            }
+            if usage:
+                self._apply_usage(result['tokens'], usage, count)
+            if cache_path:
+                self._save_cached_summary(cache_path, result)
+            results[i] = result
+        
+        return results
+    
+    def _call_api(self, messages, response_format=None, stream=False):
+        """调用DeepSeek对话接口
+        
+        Args:
+            messages (list): 发送给API的消息列表
+            response_format (dict, optional): 输出格式要求，如 {"type": "json_object"}
+            stream (bool, optional): 是否以流式方式接收，边生成边读取增量内容，
+                读取超时按相邻数据块的间隔计算
+            
+        Returns:
+            tuple: (模型返回的内容, API返回的token用量字典，未返回时为None)
+        """
+        if self.has_openai:
+            # 使用OpenAI SDK
+            kwargs = {"response_format": response_format} if response_format else {}
+            if stream:
+                # 流式响应在最后一个数据块中返回用量
+                kwargs["stream_options"] = {"include_usage": True}
+            response = self.client.chat.completions.create(
+                model="deepseek-chat",  # 使用DeepSeek-V3模型
+                messages=messages,
+                temperature=0.3,  # 较低的温度使输出更加确定性
+                stream=stream,
+                **kwargs
+            )
+            if stream:
+                parts = []
+                usage = None
+                for chunk in response:
+                    if chunk.choices:
+                        parts.append(chunk.choices[0].delta.content or "")
+                    if chunk.usage:
+                        usage = chunk.usage
+                return "".join(parts), _parse_usage(usage)
+            return response.choices[0].message.content, _parse_usage(response.usage)
+        
+        # 使用requests替代
+        payload = {
+            "model": "deepseek-chat",
+            "messages": messages,
+            "temperature": 0.3,
+            "stream": stream
+        }
+        if response_format:
+            payload["response_format"] = response_format
+        if stream:
+            payload["stream_options"] = {"include_usage": True}
+        if has_orjson:
+            # 会话已设置Content-Type，直接发送orjson编码后的请求体
+            response = self.session.post(
+                "https://api.deepseek.com/chat/completions",
+                data=orjson.dumps(payload),
+                timeout=API_TIMEOUT,
+                stream=stream
+            )
+        else:
+            response = self.session.post(
+                "https://api.deepseek.com/chat/completions",
+                json=payload,
+                timeout=API_TIMEOUT,
+                stream=stream
+            )
+        
+        try:
+            # 检查响应
+            response.raise_for_status()
+            if stream:
+                return self._read_event_stream(response)
+            data = orjson.loads(response.content) if has_orjson else response.json()
+            return data['choices'][0]['message']['content'], _parse_usage(data.get('usage'))
+        finally:
+            response.close()
+    
+    def _read_event_stream(self, response):
+        """读取流式响应（SSE），拼接各数据块中的增量内容
+        
+        Args:
+            response (requests.Response): 以stream=True发起请求的响应
+            
+        Returns:
+            tuple: (拼接后的完整内容, token用量字典，未返回时为None)
+        """
+        parts = []
+        usage = None
+        for line in response.iter_lines():
+            # 只处理data帧，跳过空行和keep-alive注释
+            if not line.startswith(b'data:'):
+                continue
+            data = line[5:].strip()
+            if data == b'[DONE]':
+                break
+            chunk = orjson.loads(data) if has_orjson else json.loads(data)
+            choices = chunk.get('choices')
+            if choices:
+                parts.append(choices[0].get('delta', {}).get('content') or "")
+            if chunk.get('usage'):
+                usage = chunk['usage']
+        return "".join(parts), _parse_usage(usage)
+    
+    def _apply_usage(self, tokens_info, usage, share=1):
+        """用API返回的实际用量更新结果中的token统计
+        
+        Args:
+            tokens_info (dict): 结果中的tokens字典，原为估算值
+            usage (dict): _parse_usage返回的用量字典
+            share (int, optional): 一次请求包含的文章数，用量按篇数平均分摊
+        """
+        input_tokens = usage['prompt_tokens'] // share
+        output_tokens = usage['completion_tokens'] // share
+        tokens_info['input'] = input_tokens
+        tokens_info['output_tokens'] = output_tokens
+        tokens_info['cached_tokens'] = usage['cached_tokens'] // share
+        tokens_info['estimated_cost'] = self.token_counter.estimate_cost(input_tokens, output_tokens)
+    
+    def _cache_path(self, messages):
+        """计算请求对应的缓存文件路径
+        
+        缓存键由模型、温度和完整消息（含系统提示词与提示词模板）计算得出，
+        提示词变化时自动失效。
+        
+        Args:
+            messages (list): 发送给API的消息列表
+            
+        Returns:
+            str: 缓存文件路径
+        """
+        key = json.dumps({"model": "deepseek-chat", "temperature": 0.3, "messages": messages},
+                         ensure_ascii=False, sort_keys=True)
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+    
+    def _load_cached_summary(self, cache_path):
+        """读取缓存的总结结果
+        
+        Args:
+            cache_path (str): 缓存文件路径
+            
+        Returns:
+            dict: 缓存的总结结果（不含原始内容），不存在或读取失败时返回None
+        """
+        try:
+            if has_orjson:
+                with open(cache_path, 'rb') as f:
+                    return orjson.loads(f.read())
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"读取总结缓存失败: {str(e)}")
+            return None
+    
+    def _save_cached_summary(self, cache_path, result):
+        """保存总结结果到缓存（不含原始内容）
+        
+        通过_write_file_atomic写入，并发写入或中途失败时不会留下不完整的缓存文件。
+        
+        Args:
+            cache_path (str): 缓存文件路径
+            result (dict): 总结结果
+        """
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            cached = {key: value for key, value in result.items() if key != 'original_content'}
+            if has_orjson:
+                data = orjson.dumps(cached)
+            else:
+                data = json.dumps(cached, ensure_ascii=False).encode('utf-8')
+            _write_file_atomic(cache_path, data)
+        except Exception as e:
+            logger.warning(f"保存总结缓存失败: {str(e)}")
+    
+    async def asummarize(self, content_data):
+        """异步总结单篇内容，在线程中执行summarize，不阻塞事件循环
+        
+        Args:
+            content_data (dict): 包含文件内容和元数据的字典
+            
+        Returns:
+            dict: 总结结果，失败时返回None
+        """
+        return await asyncio.to_thread(self.summarize, content_data)
+    
+    async def asummarize_batch(self, content_list, max_concurrency=8, batch_size=1):
+        """并发总结多篇内容
+        
+        内容按batch_size分组，每组在线程中处理：单篇通过summarize，
+        多篇通过summarize_packed合并为一次API调用；同时进行的API调用数不超过max_concurrency。
+        
+        Args:
+            content_list (list): 内容数据字典列表
+            max_concurrency (int): 同时进行的最大API调用数
+            batch_size (int): 每次API调用合并的文章数，默认为1即逐篇调用
+            
+        Returns:
+            list: 与content_list顺序对应的总结结果列表，失败的位置为None
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        batch_size = max(1, batch_size)
+        groups = [content_list[i:i + batch_size] for i in range(0, len(content_list), batch_size)]
+        
+        async def _summarize(group):
+            async with semaphore:
+                if len(group) == 1:
+                    return [await self.asummarize(group[0])]
+                return await asyncio.to_thread(self.summarize_packed, group)
+        
+        group_results = await asyncio.gather(*[_summarize(group) for group in groups])
+        return [result for results in group_results for result in results]
+    
+    def summarize_batch(self, content_list, max_concurrency=8, batch_size=1):
+        """并发总结多篇内容（同步接口）
+        
+        Args:
+            content_list (list): 内容数据字典列表
+            max_concurrency (int): 同时进行的最大API调用数
+            batch_size (int): 每次API调用合并的文章数，默认为1即逐篇调用
+            
+        Returns:
+            list: 与content_list顺序对应的总结结果列表，失败的位置为None
+        """
+        if not content_list:
+            return []
+        return asyncio.run(self.asummarize_batch(content_list, max_concurrency, batch_size))
+    
+    async def asave_summary(self, summary_data):
+        """异步保存总结内容，在线程中执行save_summary
+        
+        Args:
+            summary_data (dict): 总结结果
+            
+        Returns:
+            str: 保存的文件路径，失败则返回None
+        """
+        return await asyncio.to_thread(self.save_summary, summary_data)
+    
+    async def asummarize_and_save_batch(self, content_list, max_concurrency=8):
+        """并发总结多篇内容，每篇完成后立即保存
+        
+        保存在信号量之外进行，写文件和查找原文链接时其他文章的API调用继续进行，
+        不必等全部总结完成后再依次保存。
+        
+        Args:
+            content_list (list): 内容数据字典列表
+            max_concurrency (int): 同时进行的最大API调用数
+            
+        Returns:
+            list: 与content_list顺序对应的 (总结结果, 保存的文件路径) 列表，总结或保存失败的项为None
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _process(content_data):
+            async with semaphore:
+                summary_data = await self.asummarize(content_data)
+            if not summary_data:
+                return None, None
+            return summary_data, await self.asave_summary(summary_data)
+        
+        return await asyncio.gather(*[_process(content_data) for content_data in content_list])
+    
+    def summarize_and_save_batch(self, content_list, max_concurrency=8):
+        """并发总结多篇内容并保存（同步接口）
+        
+        Args:
+            content_list (list): 内容数据字典列表
+            max_concurrency (int): 同时进行的最大API调用数
+            
+        Returns:
+            list: 与content_list顺序对应的 (总结结果, 保存的文件路径) 列表，总结或保存失败的项为None
+        """
+        if not content_list:
+            return []
+        return asyncio.run(self.asummarize_and_save_batch(content_list, max_concurrency))
+    
     def save_summary(self, summary_data):
         """保存总结内容到文件
         
@@ -203,43 +737,53 @@ class AISummarizer:
             original_metadata = summary_data['original_content'].get('metadata', {})
             
             # 查找原文链接 - 在人民日报today-news.md中寻找对应标题的链接
-            title = original_metadata.get('title', '未知标题')
+            title = original_metadata.get('title', UNKNOWN_TITLE)
             original_link = self._find_news_link(title)
             if not original_link:
                 # 如果未找到对应链接，使用文件名作为链接
                 original_link = original_file
             
-            # 创建总结内容
-            content = "---\n"
-            content += f"title: \"AI总结: {original_metadata.get('title', '未知标题')}\"\n"
-            content += f"original_title: \"{original_metadata.get('title', '未知标题')}\"\n"
-            content += f"date: {original_metadata.get('date', datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d'))}\n"
-            content += f"source: {original_metadata.get('source', '人民日报')}\n"
-            content += f"sidebar: false\n"
-            content += f"summarized_at: {summary_data['timestamp']}\n"
+            # 元数据只取一次，日期缺失时才生成当天日期
+            if 'date' in original_metadata:
+                date_value = original_metadata['date']
+            else:
+                date_value = datetime.now(SHANGHAI_TZ).strftime('%Y-%m-%d')
+            
+            # 创建总结内容，各片段先收集到列表中最后统一拼接
+            parts = [_FRONT_MATTER_TEMPLATE.format(
+                title=title,
+                date=date_value,
+                source=original_metadata.get('source', '人民日报'),
+                summarized_at=summary_data['timestamp']
+            )]
+            append = parts.append
             
             # 添加token使用情况
             if 'tokens' in summary_data:
                 tokens_info = summary_data['tokens']
-                content += f"input_tokens: {tokens_info.get('input', 0)}\n"
-                content += f"output_chars: {tokens_info.get('output', 0)}\n"
-                content += f"estimated_cost: ${tokens_info.get('estimated_cost', 0):.6f}\n"
+                append(_TOKENS_TEMPLATE.format(
+                    input=tokens_info.get('input', 0),
+                    output=tokens_info.get('output', 0),
+                    cost=tokens_info.get('estimated_cost', 0)
+                ))
             
-            content += "---\n\n"
+            append("---\n\n")
             
             # 添加总结内容
-            content += f"# AI总结: {original_metadata.get('title', '未知标题')}\n\n"
-            content += summary_data['summary'] + "\n\n"
+            append(f"# AI总结: {title}\n\n")
+            append(summary_data['summary'])
+            append("\n\n")
             
             # 添加原文链接
-            content += f"*原文: [{title}]({original_link})*\n\n"
+            append(f"*原文: [{title}]({original_link})*\n\n")
             
             # 添加AI总结提示
-            content += "*以上内容通过AI自动总结生成，请注意AI可能存在错误或偏差，仅供参考，建议阅读原文获取完整信息。*"
+            append("*以上内容通过AI自动总结生成，请注意AI可能存在错误或偏差，仅供参考，建议阅读原文获取完整信息。*")
+            
+            content = "".join(parts)
             
-            # 保存文件
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # 保存文件：一次编码后原子替换，中途失败不会留下不完整的总结文件
+            _write_file_atomic(output_path, content.encode('utf-8'))
                 
             logger.info(f"总结内容已保存到: {output_path}")
             return output_path
@@ -251,7 +795,8 @@ class AISummarizer:
     def _find_news_link(self, title):
         """查找新闻标题对应的链接
         
-        从人民日报today-news.md文件中查找对应标题的链接
+        从人民日报today-news.md文件中查找对应标题的链接。文件中的链接行只在
+        首次调用或文件修改后解析一次，查找结果按标题缓存。
         
         Args:
             title (str): 文章标题
@@ -259,6 +804,11 @@ class AISummarizer:
         Returns:
             str: 对应的链接，如未找到则返回空字符串
         """
+        # 没有真实标题时必然查不到（空标题会匹配任意一行），不必读取文件
+        if not title or title == UNKNOWN_TITLE:
+            logger.warning(f"文章缺少标题，跳过原文链接查找: {title}")
+            return ""
+        
         try:
             # 尝试找到today-news.md文件
             docs_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))), 
@@ -268,21 +818,18 @@ class AISummarizer:
             if not os.path.exists(today_news_path):
                 logger.warning(f"未找到today-news.md文件: {today_news_path}")
                 return ""
-                
-            with open(today_news_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            # 在content中查找标题及其链接
-            # 标题格式通常为: - [标题](链接)
-            for line in content.split('\n'):
-                if line.startswith('- [') and title in line:
-                    # 提取链接
-                    match = re.search(r'\[(.*?)\]\((.*?)\)', line)
-                    if match:
-                        link_title = match.group(1)
-                        link_url = match.group(2)
-                        logger.info(f"找到文章链接: {link_title} -> {link_url}")
-                        return link_url
+            
+            entries, lookups = self._load_news_links(today_news_path)
+            
+            if title not in lookups:
+                # 标题格式通常为: - [标题](链接)，取第一个包含该标题的链接行
+                lookups[title] = next(((link_title, link_url) for line, link_title, link_url in entries
+                                       if title in line), None)
+            found = lookups[title]
+            if found:
+                link_title, link_url = found
+                logger.info(f"找到文章链接: {link_title} -> {link_url}")
+                return link_url
                 
             logger.warning(f"未找到文章标题对应的链接: {title}")
             return ""
@@ -290,6 +837,26 @@ class AISummarizer:
             logger.error(f"查找文章链接时出错: {str(e)}")
             return ""
     
+    def _load_news_links(self, today_news_path):
+        """读取并缓存today-news.md中的链接行，文件修改后重新读取
+        
+        Args:
+            today_news_path (str): today-news.md文件路径
+            
+        Returns:
+            tuple: (链接行列表 [(行内容, 链接标题, 链接), ...], 按标题缓存的查找结果字典)
+        """
+        file_key = (today_news_path, os.stat(today_news_path).st_mtime_ns)
+        if self._news_links is None or self._news_links[0] != file_key:
+            with open(today_news_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            
+            # 一次扫描整个文件取出所有链接行，不再逐行切分和匹配
+            entries = [(match.group(0), match.group(1), match.group(2))
+                       for match in _NEWS_LINK_LINE_RE.finditer(content)]
+            self._news_links = (file_key, entries, {})
+        return self._news_links[1], self._news_links[2]
+    
     def _generate_fixed_prompt(self, content_data):
         """生成固定格式的提示词
         
@@ -299,25 +866,22 @@ class AISummarizer:
         Returns:
             str: 总结提示词
         """
-        content = content_data.get('content', '')
+        # 使用固定格式的提示词，只有文章内容需要拼接
+        return _PROMPT_HEAD + content_data.get('content', '') + _PROMPT_TAIL
+    
+    def _generate_packed_prompt(self, content_list):
+        """生成多篇文章合并总结的提示词
         
-        # 使用固定格式的提示词
-        prompt = f"""
-[文章内容]
-{content}
-```
-帮我总结以上新闻内容，字数控制在200左右，结果以以下模板输出：
----
-- 时间：
-- 地点：
-- 人物：
-- 事件：
-- 起因：
-- 结果：
----
-直接输出结果，不要有任何多余的内容。
-"""
-        return prompt
+        Args:
+            content_list (list): 内容数据字典列表
+            
+        Returns:
+            str: 总结提示词，文章按1开始编号
+        """
+        parts = [_PACKED_PROMPT_HEAD.format(count=len(content_list))]
+        for number, content_data in enumerate(content_list, 1):
+            parts.append(_PACKED_ARTICLE_TEMPLATE.format(number=number, content=content_data.get('content', '')))
+        return "".join(parts)
     
     def _generate_mock_summary(self, content_data):
         """生成模拟的总结内容，用于没有API密钥的情况
@@ -329,37 +893,32 @@ class AISummarizer:
             str: 模拟的总结内容
         """
         metadata = content_data.get('metadata', {})
-        title = metadata.get('title', '未知标题')
-        date = metadata.get('date', datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d'))
+        title = metadata.get('title', UNKNOWN_TITLE)
         
-        # 分析内容找出一些关键信息
+        # 分析内容找出一些关键信息，简单识别时间，只需要第一个匹配
         content = content_data.get('content', '')
-        # 简单识别一些时间、地点、人物
-        time_pattern = r'(\d{4}年\d{1,2}月\d{1,2}日)'
-        times = re.findall(time_pattern, content)
-        time_str = times[0] if times else date
-        
-        # 从内容中提取前200个字符作为事件描述
-        event_desc = content[:200].strip() if len(content) > 0 else "无法提取事件描述"
+        time_match = _CN_DATE_RE.search(content) if content else None
+        if time_match:
+            time_str = time_match.group(0)
+        elif 'date' in metadata:
+            time_str = metadata['date']
+        else:
+            time_str = datetime.now(SHANGHAI_TZ).strftime('%Y-%m-%d')
         
         # 生成模拟总结
-        mock_summary = f"""时间：{time_str}
-地点：模拟地点
-人物：模拟人物
-事件：{title}
-起因：这是一个模拟总结，由于未提供API密钥，系统生成了这个示例。
-结果：为了完整展示功能，系统提供了这个模板化的总结。实际使用时，请提供有效的DeepSeek API密钥。"""
-        
-        return mock_summary 
+        return _MOCK_SUMMARY_TEMPLATE.format(time=time_str, title=title)
 
 if __name__ == "__main__":
     # 配置命令行参数
     parser = argparse.ArgumentParser(description='AI总结工具')
-    parser.add_argument('-f', '--file', help='要总结的文件路径')
+    parser.add_argument('-f', '--file', action='append', help='要总结的文件路径，可多次指定以批量总结多个文件')
     parser.add_argument('-k', '--api_key', help='DeepSeek API密钥，如未提供则使用DEEPSEEK_API_KEY环境变量')
     parser.add_argument('-o', '--output_dir', help='输出目录路径')
     parser.add_argument('-m', '--mock', action='store_true', help='使用模拟模式，不调用实际API')
     parser.add_argument('-t', '--text', help='直接提供要总结的文本内容')
+    parser.add_argument('--no-cache', dest='use_cache', action='store_false', help='不使用总结结果缓存（默认位于~/.cache/news-aggregator/summary），总是调用API')
+    parser.add_argument('--cache-dir', help='总结结果缓存目录，默认使用NEWS_SUMMARY_CACHE_DIR环境变量或~/.cache/news-aggregator/summary')
+    parser.add_argument('-b', '--batch_size', type=int, default=8, help='批量总结时每次API调用合并的文件数')
     parser.add_argument('-v', '--verbose', action='store_true', help='输出详细日志')
     args = parser.parse_args()
     
@@ -374,54 +933,46 @@ if __name__ == "__main__":
         summarizer = AISummarizer(
             api_key=args.api_key, 
             output_dir=args.output_dir,
-            use_mock=args.mock
+            use_mock=args.mock,
+            use_cache=args.use_cache,
+            cache_dir=args.cache_dir
         )
         
         # 准备内容数据
-        content_data = None
+        content_list = []
         
         if args.file:
-            # 从文件读取内容
-            if not os.path.exists(args.file):
-                print(f"错误: 文件不存在: {args.file}")
-                sys.exit(1)
-                
-            try:
-                with open(args.file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # 简单解析Markdown前的元数据（frontmatter）
-                metadata = {}
-                main_content = content
-                
-                # 检查是否有frontmatter（以---开始和结束的部分）
-                if content.startswith('---'):
-                    end_index = content.find('---', 3)
-                    if end_index > 0:
-                        frontmatter = content[3:end_index].strip()
-                        main_content = content[end_index+3:].strip()
-                        
-                        # 解析frontmatter中的键值对
-                        for line in frontmatter.split('\n'):
-                            if ':' in line:
-                                key, value = line.split(':', 1)
-                                metadata[key.strip()] = value.strip()
-                
-                content_data = {
-                    'file_path': args.file,
-                    'file_name': os.path.basename(args.file),
-                    'metadata': metadata,
-                    'content': main_content
-                }
-                
-                print(f"已读取文件: {args.file}")
-                print(f"元数据: {metadata}")
-                print(f"内容长度: {len(main_content)} 字符")
-                
-            except Exception as e:
-                print(f"读取文件时出错: {str(e)}")
-                sys.exit(1)
+            for file_path in args.file:
+                # 从文件读取内容
+                if not os.path.exists(file_path):
+                    print(f"错误: 文件不存在: {file_path}")
+                    sys.exit(1)
+            
+            # 多个文件时用线程池并行读取，结果顺序与参数顺序一致
+            with ThreadPoolExecutor(max_workers=min(8, len(args.file))) as executor:
+                futures = [executor.submit(read_frontmatter_file, file_path) for file_path in args.file]
+            
+            for file_path, future in zip(args.file, futures):
+                try:
+                    # 读取文件并解析Markdown前的元数据（frontmatter）
+                    metadata, main_content = future.result()
+                    
+                    content_data = {
+                        'file_path': file_path,
+                        'file_name': os.path.basename(file_path),
+                        'metadata': metadata,
+                        'content': main_content
+                    }
+                    
+                    print(f"已读取文件: {file_path}")
+                    print(f"元数据: {metadata}")
+                    print(f"内容长度: {len(main_content)} 字符")
+                    content_list.append(content_data)
                 
+                except Exception as e:
+                    print(f"读取文件时出错: {str(e)}")
+                    sys.exit(1)
+        
         elif args.text:
             # 使用直接提供的文本
             content_data = {
@@ -429,17 +980,46 @@ if __name__ == "__main__":
                 'file_name': 'direct_input.md',
                 'metadata': {
                     'title': '直接输入的内容',
-                    'date': datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d')
+                    'date': datetime.now(SHANGHAI_TZ).strftime('%Y-%m-%d')
                 },
                 'content': args.text
             }
             
+            content_list.append(content_data)
             print(f"使用直接输入的文本，长度: {len(args.text)} 字符")
-            
+        
         else:
             print("错误: 必须提供文件路径或文本内容")
             parser.print_help()
             sys.exit(1)
+
+        # 多个文件时批量总结，每次API调用合并batch_size个文件
+        if len(content_list) > 1:
+            print(f"\n正在批量总结 {len(content_list)} 个文件...")
+            results = summarizer.summarize_batch(content_list, batch_size=args.batch_size)
+            failed = 0
+            for content_data, summary_data in zip(content_list, results):
+                if not summary_data:
+                    failed += 1
+                    print(f"总结失败: {content_data['file_name']}")
+                    continue
+                
+                if args.output_dir:
+                    output_file = summarizer.save_summary(summary_data)
+                    if output_file:
+                        print(f"总结已保存到: {output_file}")
+                    else:
+                        print(f"保存总结失败: {content_data['file_name']}")
+                else:
+                    print(f"\n{content_data['file_name']} 总结内容:")
+                    print("-" * 50)
+                    print(summary_data['summary'])
+                    print("-" * 50)
+            
+            print(f"\n批量总结完成: 成功 {len(content_list) - failed}/{len(content_list)}")
+            sys.exit(1 if failed else 0)
+        
+        content_data = content_list[0]
         
         # 进行内容总结
         print("\n正在进行内容总结...")
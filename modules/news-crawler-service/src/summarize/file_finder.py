@@ -3,14 +3,31 @@
 
 import os
 import re
+import time
 import logging
 import argparse
 import sys
 from datetime import datetime, timedelta
-import pytz
+from zoneinfo import ZoneInfo
+
+# 北京时区，模块加载时解析一次
+SHANGHAI_TZ = ZoneInfo('Asia/Shanghai')
+
+# 待总结文件名格式：YYYYMMDD-XXXX.md，例如20250412-0101.md
+_ARTICLE_FILE_RE = re.compile(r'^\d{8}-\d{4}\.md$')
+
+# 目录扫描结果缓存：{(输出目录, 日期): (目录修改时间, 匹配文件列表)}
+_LISTING_CACHE = {}
+
+# 目录修改时间距今不足该时长（纳秒）时不使用缓存，避免文件系统时间戳精度不足时漏掉新文件
+_LISTING_CACHE_MIN_AGE_NS = 2_000_000_000
 
 logger = logging.getLogger("FileFinder")
 
+def clear_cache():
+    """清空目录扫描结果缓存"""
+    _LISTING_CACHE.clear()
+
 class FileFinder:
     """文件查找器
     
@@ -43,7 +60,7 @@ class FileFinder:
         Returns:
             str: 日期字符串，格式为YYYYMMDD
         """
-        return datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y%m%d')
+        return datetime.now(SHANGHAI_TZ).strftime('%Y%m%d')
     
     def get_yesterday_date(self):
         """获取前一天北京时间的日期字符串
@@ -51,7 +68,7 @@ class FileFinder:
         Returns:
             str: 日期字符串，格式为YYYYMMDD
         """
-        yesterday = datetime.now(pytz.timezone('Asia/Shanghai')) - timedelta(days=1)
+        yesterday = datetime.now(SHANGHAI_TZ) - timedelta(days=1)
         return yesterday.strftime('%Y%m%d')
     
     def find_matching_files(self):
@@ -66,8 +83,7 @@ class FileFinder:
         today_date = self.get_current_date()
         
         # 查找当天的匹配文件
-        today_pattern = f"^{today_date}-.*\\.md$"
-        today_files = self._find_files_by_pattern(today_pattern)
+        today_files = self._find_files_by_date(today_date)
         
         if today_files:
             logger.info(f"找到当天({today_date})的匹配文件: {len(today_files)}个")
@@ -75,8 +91,7 @@ class FileFinder:
         
         # 如果当天没有匹配文件，查找前一天的
         yesterday_date = self.get_yesterday_date()
-        yesterday_pattern = f"^{yesterday_date}-.*\\.md$"
-        yesterday_files = self._find_files_by_pattern(yesterday_pattern)
+        yesterday_files = self._find_files_by_date(yesterday_date)
         
         if yesterday_files:
             logger.info(f"找到前一天({yesterday_date})的匹配文件: {len(yesterday_files)}个")
@@ -86,31 +101,46 @@ class FileFinder:
         logger.warning(f"未找到当天({today_date})或前一天({yesterday_date})的匹配文件")
         return []
     
-    def _find_files_by_pattern(self, pattern):
-        """根据正则表达式模式查找文件
+    def _find_files_by_date(self, date_string):
+        """查找指定日期开头的文件
         
         Args:
-            pattern (str): 正则表达式模式
+            date_string (str): 日期字符串，格式为YYYYMMDD
             
         Returns:
             list: 匹配文件的路径列表
         """
         matching_files = []
+        prefix = f"{date_string}-"
         
         try:
-            for filename in os.listdir(self.output_dir):
-                # 检查文件是否匹配模式（日期开头）
-                if re.match(pattern, filename):
+            # 目录中增删文件都会更新目录的修改时间，修改时间不变时直接使用上次的扫描结果
+            cache_key = (self.output_dir, date_string)
+            dir_mtime_ns = os.stat(self.output_dir).st_mtime_ns
+            cached = _LISTING_CACHE.get(cache_key)
+            if cached and cached[0] == dir_mtime_ns:
+                logger.debug("使用缓存的目录扫描结果: %s", date_string)
+                return list(cached[1])
+            
+            # scandir返回的目录项自带文件类型，判断是否为文件时通常不需要额外stat
+            with os.scandir(self.output_dir) as entries:
+                for entry in entries:
+                    filename = entry.name
+                    # 检查文件是否以日期开头（先做前缀比较，排除绝大多数文件）
+                    if not filename.startswith(prefix) or not filename.endswith('.md'):
+                        continue
                     # 检查文件是否符合YYYYMMDD-XXXX.md格式
                     # 允许使用格式如20250412-0101.md的文件
-                    if re.match(r'^\d{8}-\d{4}\.md$', filename):
-                        file_path = os.path.join(self.output_dir, filename)
-                        if os.path.isfile(file_path):
-                            matching_files.append(file_path)
-                            logger.debug(f"找到匹配文件: {filename}")
+                    if _ARTICLE_FILE_RE.match(filename):
+                        if entry.is_file():
+                            matching_files.append(entry.path)
+                            logger.debug("找到匹配文件: %s", filename)
                     else:
                         # 记录不符合格式的文件，但是使用INFO级别而不是DEBUG级别
-                        logger.info(f"文件名格式不符合要求，已排除: {filename}")
+                        logger.info("文件名格式不符合要求，已排除: %s", filename)
+            
+            if time.time_ns() - dir_mtime_ns >= _LISTING_CACHE_MIN_AGE_NS:
+                _LISTING_CACHE[cache_key] = (dir_mtime_ns, list(matching_files))
         except Exception as e:
             logger.error(f"查找文件时出错: {str(e)}")
         
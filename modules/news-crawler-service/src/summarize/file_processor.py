@@ -2,13 +2,92 @@
 # -*- coding: utf-8 -*-
 
 import os
+import mmap
 import random
 import logging
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger("FileProcessor")
 
+# 日志格式化器，模块加载时创建一次，各实例初始化日志时共用
+_LOG_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+def parse_frontmatter(content):
+    """解析Markdown前的元数据（frontmatter）
+    
+    frontmatter为以---开始和结束的部分，其中每行为"键: 值"。
+    
+    Args:
+        content (str): Markdown文件内容
+        
+    Returns:
+        tuple: (元数据字典, 去掉frontmatter后的正文)，没有frontmatter时正文为原内容
+    """
+    metadata = {}
+    if not content.startswith('---'):
+        return metadata, content
+    
+    end_index = content.find('---', 3)
+    if end_index <= 0:
+        return metadata, content
+    
+    return _parse_metadata(content[3:end_index]), content[end_index+3:].strip()
+
+def _parse_metadata(text):
+    """解析frontmatter中的"键: 值"行
+    
+    Args:
+        text (str): 两个---之间的内容
+        
+    Returns:
+        dict: 元数据字典
+    """
+    metadata = {}
+    for line in text.strip().split('\n'):
+        key, sep, value = line.partition(':')
+        if sep:
+            metadata[key.strip()] = value.strip()
+    return metadata
+
+def _decode_text(data):
+    """按UTF-8解码，并与文本模式读取一样统一换行符为\\n
+    
+    Args:
+        data (bytes): 原始字节
+        
+    Returns:
+        str: 解码后的文本
+    """
+    text = data.decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+def read_frontmatter_file(file_path):
+    """读取Markdown文件并解析frontmatter，结果与parse_frontmatter(文件内容)一致
+    
+    通过mmap映射文件，在字节上查找frontmatter的分隔符，只解码需要的部分，
+    避免先把整个文件读成字符串再切片产生的额外副本。
+    
+    Args:
+        file_path (str): 文件路径
+        
+    Returns:
+        tuple: (元数据字典, 去掉frontmatter后的正文)
+    """
+    with open(file_path, 'rb') as f:
+        # 空文件无法映射
+        if os.fstat(f.fileno()).st_size == 0:
+            return {}, ''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # ---为ASCII字符，字节偏移与UTF-8文本中的分隔位置一一对应
+            end_index = mm.find(b'---', 3) if mm[:3] == b'---' else -1
+            if end_index <= 0:
+                return {}, _decode_text(mm[:])
+            return _parse_metadata(_decode_text(mm[3:end_index])), _decode_text(mm[end_index+3:]).strip()
+
 class FileProcessor:
     """文件处理器
     
@@ -20,8 +99,7 @@ class FileProcessor:
         # 设置日志
         if not logger.handlers:
             handler = logging.StreamHandler()
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            handler.setFormatter(formatter)
+            handler.setFormatter(_LOG_FORMATTER)
             logger.addHandler(handler)
             logger.setLevel(logging.INFO)
     
@@ -39,9 +117,27 @@ class FileProcessor:
             return None
         
         selected_file = random.choice(file_list)
-        logger.info(f"随机选择的文件: {os.path.basename(selected_file)}")
+        logger.info("随机选择的文件: %s", os.path.basename(selected_file))
         return selected_file
     
+    def select_random_files(self, file_list, k):
+        """从文件列表中一次随机选择k个不重复的文件
+        
+        Args:
+            file_list (list): 文件路径列表
+            k (int): 要选择的文件数量，超过列表长度时全部选中
+            
+        Returns:
+            list: 选中的文件路径列表，如果列表为空则返回空列表
+        """
+        if not file_list:
+            logger.warning("文件列表为空，无法选择")
+            return []
+        
+        selected_files = random.sample(file_list, min(k, len(file_list)))
+        logger.info(f"随机选择了{len(selected_files)}个文件")
+        return selected_files
+    
     def extract_content(self, file_path):
         """提取文件内容
         
@@ -51,49 +147,54 @@ class FileProcessor:
         Returns:
             dict: 包含文件内容和元数据的字典
         """
-        if not file_path or not os.path.exists(file_path):
+        if not file_path:
             logger.error(f"文件不存在: {file_path}")
             return None
         
+        file_name = os.path.basename(file_path)
         try:
-            logger.info(f"正在提取文件内容: {os.path.basename(file_path)}")
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # 解析Markdown前的元数据（frontmatter）
-            metadata = {}
-            main_content = content
+            logger.info("正在提取文件内容: %s", file_name)
             
-            # 检查是否有frontmatter（以---开始和结束的部分）
-            if content.startswith('---'):
-                end_index = content.find('---', 3)
-                if end_index > 0:
-                    frontmatter = content[3:end_index].strip()
-                    main_content = content[end_index+3:].strip()
-                    
-                    # 解析frontmatter中的键值对
-                    for line in frontmatter.split('\n'):
-                        if ':' in line:
-                            key, value = line.split(':', 1)
-                            metadata[key.strip()] = value.strip()
+            # 读取文件并解析Markdown前的元数据（frontmatter）
+            metadata, main_content = read_frontmatter_file(file_path)
             
             result = {
                 'file_path': file_path,
-                'file_name': os.path.basename(file_path),
+                'file_name': file_name,
                 'metadata': metadata,
                 'content': main_content
             }
             
-            # 在控制台输出文件内容预览
-            preview_length = min(500, len(main_content))
-            logger.info(f"文件内容预览 ({preview_length}字符):\n{main_content[:preview_length]}...")
+            # 在控制台输出文件内容预览，日志级别高于INFO时不截取内容
+            if logger.isEnabledFor(logging.INFO):
+                preview_length = min(500, len(main_content))
+                logger.info("文件内容预览 (%d字符):\n%s...", preview_length, main_content[:preview_length])
             
             return result
             
+        except FileNotFoundError:
+            # 不预先检查文件是否存在，直接打开，省去一次stat
+            logger.error(f"文件不存在: {file_path}")
+            return None
         except Exception as e:
             logger.error(f"提取文件内容时出错: {str(e)}")
             return None 
+    
+    def extract_contents(self, file_paths, max_workers=8):
+        """用线程池并行提取多个文件的内容，多个文件的读取可以相互重叠
+        
+        Args:
+            file_paths (list): 文件路径列表
+            max_workers (int, optional): 最大线程数，默认为8
+            
+        Returns:
+            list: 与file_paths顺序一致的结果列表，提取失败的位置为None
+        """
+        if not file_paths:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(file_paths))) as executor:
+            return list(executor.map(self.extract_content, file_paths))
 
 if __name__ == "__main__":
     # 配置命令行参数
@@ -135,30 +236,23 @@ if __name__ == "__main__":
                 print(f"错误: 指定的目录不存在: {args.directory}")
                 sys.exit(1)
                 
-            # 获取目录中的所有 .md 文件
-            md_files = [os.path.join(args.directory, f) for f in os.listdir(args.directory) 
-                       if f.endswith('.md') and os.path.isfile(os.path.join(args.directory, f))]
+            # 获取目录中的所有 .md 文件，scandir的目录项自带文件类型，无需逐个stat
+            with os.scandir(args.directory) as entries:
+                md_files = [entry.path for entry in entries
+                            if entry.name.endswith('.md') and entry.is_file()]
             
             if not md_files:
                 print(f"目录中未找到.md文件: {args.directory}")
                 sys.exit(1)
                 
-            # 选择要处理的文件数量
-            num_files = min(args.num_files, len(md_files))
-            selected_files = []
-            
-            for _ in range(num_files):
-                if not md_files:
-                    break
-                selected_file = processor.select_random_file(md_files)
-                md_files.remove(selected_file)  # 确保不重复选择
-                selected_files.append(selected_file)
+            # 一次选出不重复的文件，并行提取内容
+            selected_files = processor.select_random_files(md_files, args.num_files)
+            contents = processor.extract_contents(selected_files)
             
             # 处理选中的文件
             print(f"\n已选择 {len(selected_files)} 个文件进行处理:")
-            for i, file_path in enumerate(selected_files, 1):
+            for i, (file_path, content_data) in enumerate(zip(selected_files, contents), 1):
                 print(f"\n--- 处理文件 {i}/{len(selected_files)}: {os.path.basename(file_path)} ---")
-                content_data = processor.extract_content(file_path)
                 
                 if content_data:
                     print(f"元数据:")
@@ -6,13 +6,9 @@ import sys
 import logging
 import argparse
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
 import random
 
-from src.summarize.file_finder import FileFinder
-from src.summarize.file_processor import FileProcessor
-from src.summarize.ai_summarizer import AISummarizer
-
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -22,20 +18,31 @@ logging.basicConfig(
     ]
 )
 
+# 北京时区，模块加载时解析一次
+SHANGHAI_TZ = ZoneInfo('Asia/Shanghai')
+
 logger = logging.getLogger("AISummarizeMain")
 
-def run_summarize(api_key=None, output_dir=None, use_mock=False):
+def run_summarize(api_key=None, output_dir=None, use_mock=False, summarize_all=False, max_concurrency=8, use_cache=True, cache_dir=None):
     """运行AI总结流程
     
     Args:
         api_key (str, optional): DeepSeek API密钥
         output_dir (str, optional): 输出目录路径
         use_mock (bool, optional): 是否使用模拟模式，不调用实际API
+        summarize_all (bool, optional): 是否总结所有匹配的文件，默认只随机总结一个
+        max_concurrency (int, optional): 总结所有文件时同时进行的最大API调用数
+        use_cache (bool, optional): 是否使用总结结果缓存，相同内容不再重复调用API
+        cache_dir (str, optional): 总结结果缓存目录，默认不在输出目录下，见ai_summarizer.default_cache_dir()
         
     Returns:
         bool: 操作是否成功
     """
-    china_time = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+    # 按需导入，只解析命令行参数（如--help）时不加载requests等依赖
+    from src.summarize.file_finder import FileFinder
+    from src.summarize.file_processor import FileProcessor
+    
+    china_time = datetime.now(SHANGHAI_TZ).strftime('%Y-%m-%d %H:%M:%S')
     logger.info(f"AI内容总结流程开始 (北京时间: {china_time})")
     
     # 如果使用模拟模式，输出提示
@@ -56,9 +63,12 @@ def run_summarize(api_key=None, output_dir=None, use_mock=False):
     for i, file_path in enumerate(matching_files, 1):
         logger.info(f"{i}. {os.path.basename(file_path)}")
     
+    file_processor = FileProcessor()
+    if summarize_all:
+        return _summarize_all_files(file_processor, matching_files, api_key, output_dir, use_mock, max_concurrency, use_cache, cache_dir)
+    
     # 2. 随机选择文件并提取内容
     logger.info("第二步: 随机选择文件并提取内容")
-    file_processor = FileProcessor()
     selected_file = file_processor.select_random_file(matching_files)
     
     if not selected_file:
@@ -73,7 +83,8 @@ def run_summarize(api_key=None, output_dir=None, use_mock=False):
     
     # 3. 调用DeepSeek API进行内容总结
     logger.info("第三步: 调用DeepSeek API进行内容总结")
-    summarizer = AISummarizer(api_key=api_key, output_dir=output_dir, use_mock=use_mock)
+    from src.summarize.ai_summarizer import AISummarizer
+    summarizer = AISummarizer(api_key=api_key, output_dir=output_dir, use_mock=use_mock, use_cache=use_cache, cache_dir=cache_dir)
     
     summary_data = summarizer.summarize(content_data)
     
@@ -90,12 +101,62 @@ def run_summarize(api_key=None, output_dir=None, use_mock=False):
         return False
     
     # 完成时使用北京时间
-    china_time = datetime.now(pytz.timezone('Asia/Shanghai')).strftime('%Y-%m-%d %H:%M:%S')
+    china_time = datetime.now(SHANGHAI_TZ).strftime('%Y-%m-%d %H:%M:%S')
     logger.info(f"AI内容总结流程完成 (北京时间: {china_time})")
     logger.info(f"总结文件已保存到: {summary_file}")
     
     return True
 
+def _summarize_all_files(file_processor, matching_files, api_key, output_dir, use_mock, max_concurrency, use_cache, cache_dir):
+    """并发总结所有匹配的文件并保存结果
+    
+    Args:
+        file_processor (FileProcessor): 文件处理器
+        matching_files (list): 匹配的文件路径列表
+        api_key (str): DeepSeek API密钥
+        output_dir (str): 输出目录路径
+        use_mock (bool): 是否使用模拟模式
+        max_concurrency (int): 同时进行的最大API调用数
+        use_cache (bool): 是否使用总结结果缓存
+        cache_dir (str): 总结结果缓存目录，为None时使用默认目录
+        
+    Returns:
+        bool: 所有文件是否都总结并保存成功
+    """
+    # 2. 提取所有文件的内容
+    logger.info("第二步: 提取所有匹配文件的内容")
+    content_list = []
+    for file_path, content_data in zip(matching_files, file_processor.extract_contents(matching_files)):
+        if content_data:
+            content_list.append(content_data)
+        else:
+            logger.error(f"提取文件内容失败: {file_path}")
+    
+    if not content_list:
+        logger.error("没有可总结的文件内容，结束流程")
+        return False
+    
+    # 3. 并发调用DeepSeek API进行内容总结，4. 每篇总结完成后立即保存
+    logger.info(f"第三步: 并发调用DeepSeek API总结 {len(content_list)} 个文件并保存结果（并发数: {max_concurrency}）")
+    from src.summarize.ai_summarizer import AISummarizer
+    summarizer = AISummarizer(api_key=api_key, output_dir=output_dir, use_mock=use_mock, use_cache=use_cache, cache_dir=cache_dir)
+    results = summarizer.summarize_and_save_batch(content_list, max_concurrency=max_concurrency)
+    
+    saved = 0
+    for content_data, (summary_data, summary_file) in zip(content_list, results):
+        if not summary_data:
+            logger.error(f"内容总结失败: {content_data['file_name']}")
+        elif summary_file:
+            saved += 1
+            logger.info(f"总结文件已保存到: {summary_file}")
+        else:
+            logger.error(f"保存总结结果失败: {content_data['file_name']}")
+    
+    china_time = datetime.now(SHANGHAI_TZ).strftime('%Y-%m-%d %H:%M:%S')
+    logger.info(f"AI内容总结流程完成 (北京时间: {china_time})，成功 {saved}/{len(matching_files)} 个文件")
+    
+    return saved == len(matching_files)
+
 def main(args=None):
     """主程序入口"""
     if args is None:
@@ -103,6 +164,10 @@ def main(args=None):
         parser.add_argument('-k', '--api_key', help='DeepSeek API密钥，如未提供则使用DEEPSEEK_API_KEY环境变量')
         parser.add_argument('-o', '--output_dir', help='输出目录路径')
         parser.add_argument('-m', '--mock', action='store_true', help='使用模拟模式，不调用实际API')
+        parser.add_argument('-a', '--all', action='store_true', help='并发总结所有匹配的文件，而不是随机选择一个')
+        parser.add_argument('-c', '--concurrency', type=int, default=8, help='总结所有文件时同时进行的最大API调用数')
+        parser.add_argument('--no-cache', dest='use_cache', action='store_false', help='不使用总结结果缓存（默认位于~/.cache/news-aggregator/summary），总是调用API')
+        parser.add_argument('--cache-dir', help='总结结果缓存目录，默认使用NEWS_SUMMARY_CACHE_DIR环境变量或~/.cache/news-aggregator/summary')
         parser.add_argument('-v', '--verbose', action='store_true', help='输出详细日志')
         args = parser.parse_args()
         
@@ -114,7 +179,11 @@ def main(args=None):
     success = run_summarize(
         api_key=args.api_key, 
         output_dir=args.output_dir,
-        use_mock=args.mock if hasattr(args, 'mock') else False
+        use_mock=args.mock if hasattr(args, 'mock') else False,
+        summarize_all=args.all if hasattr(args, 'all') else False,
+        max_concurrency=args.concurrency if hasattr(args, 'concurrency') else 8,
+        use_cache=args.use_cache if hasattr(args, 'use_cache') else True,
+        cache_dir=args.cache_dir if hasattr(args, 'cache_dir') else None
     )
     
     return 0 if success else 1
@@ -6,9 +6,73 @@ import logging
 import unicodedata
 import argparse
 import sys
+from functools import lru_cache
 
 logger = logging.getLogger("TokenCounter")
 
+# 日志格式化器，模块加载时创建一次，各实例初始化日志时共用
+_LOG_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+@lru_cache(maxsize=65536)
+def _is_cjk_char(char):
+    """判断单个字符是否为中文字符，结果按字符缓存
+    
+    中文文本中常用字反复出现，缓存后每个字符只需查询一次Unicode名称。
+    
+    Args:
+        char (str): 输入字符
+        
+    Returns:
+        bool: 是否为中文字符
+    """
+    try:
+        # 使用Unicode字符名称判断
+        return 'CJK' in unicodedata.name(char)
+    except ValueError:
+        return False
+
+@lru_cache(maxsize=None)
+def _cjk_run_pattern():
+    """构建匹配连续中文字符的正则表达式，首次使用时构建一次
+    
+    字符集合与_is_cjk_char一致：遍历Unicode名称中含CJK的码位并合并为区间。
+    这些字符都位于前4个平面（0x0000-0x3FFFF），只需扫描这一范围。
+    
+    Returns:
+        re.Pattern: 匹配一段连续中文字符的正则表达式
+    """
+    ranges = []
+    start = prev = None
+    for code in range(0x40000):
+        if 'CJK' not in unicodedata.name(chr(code), ''):
+            continue
+        if prev is not None and code == prev + 1:
+            prev = code
+            continue
+        if start is not None:
+            ranges.append((start, prev))
+        start = prev = code
+    if start is not None:
+        ranges.append((start, prev))
+    char_class = ''.join(f'{re.escape(chr(low))}-{re.escape(chr(high))}' for low, high in ranges)
+    return re.compile(f'[{char_class}]+')
+
+def count_cjk_chars(text):
+    """统计文本中的中文字符数
+    
+    用正则表达式在C层面找出连续的中文字符段再累加长度，
+    不再对每个字符调用一次Python函数。
+    
+    Args:
+        text (str): 输入文本
+        
+    Returns:
+        int: 中文字符数
+    """
+    if not text or text.isascii():
+        return 0
+    return sum(map(len, _cjk_run_pattern().findall(text)))
+
 class TokenCounter:
     """Token计数器
     
@@ -16,13 +80,15 @@ class TokenCounter:
     参考：https://api-docs.deepseek.com/zh-cn/
     """
     
+    # 计数器没有实例状态，不需要实例字典
+    __slots__ = ()
+    
     def __init__(self):
         """初始化Token计数器"""
         # 设置日志
         if not logger.handlers:
             handler = logging.StreamHandler()
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            handler.setFormatter(formatter)
+            handler.setFormatter(_LOG_FORMATTER)
             logger.addHandler(handler)
             logger.setLevel(logging.INFO)
     
@@ -42,7 +108,7 @@ class TokenCounter:
         text = text.strip()
         
         # 中文字符计数 (每个中文字符约为1个token)
-        chinese_chars = sum(1 for char in text if self._is_chinese(char))
+        chinese_chars = count_cjk_chars(text)
         
         # 非中文字符的字数 (大约每4个非中文字符为1个token)
         non_chinese_chars = len(text) - chinese_chars
@@ -130,11 +196,7 @@ class TokenCounter:
         Returns:
             bool: 是否为中文字符
         """
-        try:
-            # 使用Unicode东亚宽度特性判断
-            return 'CJK' in unicodedata.name(char)
-        except:
-            return False 
+        return _is_cjk_char(char)
 
 if __name__ == "__main__":
     # 配置命令行参数
@@ -207,7 +269,7 @@ if __name__ == "__main__":
         print(f"- 预估API调用成本: ${cost:.6f}")
         
         # 字符类型统计
-        chinese_chars = sum(1 for char in text if counter._is_chinese(char))
+        chinese_chars = count_cjk_chars(text)
         print(f"\n字符类型分布:")
         print(f"- 中文字符: {chinese_chars} ({chinese_chars/len(text)*100:.1f}%)")
         print(f"- 非中文字符: {len(text) - chinese_chars} ({(len(text) - chinese_chars)/len(text)*100:.1f}%)")
@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import copy
 import json
 import os
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 已解析的配置文件缓存：{配置文件路径: ((修改时间, 文件大小), 配置数据)}
+_CONFIG_CACHE = {}
+
 class ConfigManager:
     """配置管理类
     
@@ -27,18 +31,32 @@ class ConfigManager:
         self.config_path = config_path
         self.config = self._load_config()
     
-    def _load_config(self):
+    def _load_config(self, use_cache=True):
         """加载配置文件
         
+        同一配置文件只解析一次，文件的修改时间或大小变化后才重新读取。
+        每个实例拿到的是缓存的独立副本，修改配置不会影响其他实例。
+        
+        Args:
+            use_cache (bool, optional): 是否使用已解析的缓存. 默认为True.
+        
         Returns:
             dict: 配置数据
         """
         try:
+            stat = os.stat(self.config_path)
+            file_key = (stat.st_mtime_ns, stat.st_size)
+            cached = _CONFIG_CACHE.get(self.config_path)
+            if use_cache and cached and cached[0] == file_key:
+                logger.debug(f"使用已缓存的配置: {self.config_path}")
+                return copy.deepcopy(cached[1])
+            
             logger.info(f"加载配置文件: {self.config_path}")
             with open(self.config_path, 'r', encoding='utf-8') as f:
                 config = json.load(f)
+            _CONFIG_CACHE[self.config_path] = (file_key, config)
             logger.info("配置文件加载成功")
-            return config
+            return copy.deepcopy(config)
         except Exception as e:
             logger.error(f"加载配置文件失败: {str(e)}")
             # 返回空配置，避免程序崩溃
@@ -71,7 +89,7 @@ class ConfigManager:
     def reload(self):
         """重新加载配置文件"""
         logger.info("重新加载配置文件")
-        self.config = self._load_config()
+        self.config = self._load_config(use_cache=False)
         return self.config
 
 # 创建默认配置管理器实例
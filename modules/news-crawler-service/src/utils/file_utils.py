@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+def write_file(filepath, content):
+    """将内容写入文件
+    
+    文本一次性编码为UTF-8后以二进制方式写入，覆盖已有文件。
+    
+    Args:
+        filepath (str): 文件路径
+        content (str|bytes): 文件内容，bytes将直接写入
+    
+    Returns:
+        str: 写入的文件路径
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    with open(filepath, 'wb') as f:
+        f.write(content)
+    return filepath
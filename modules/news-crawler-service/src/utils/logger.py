@@ -5,6 +5,9 @@ import logging
 import os
 from logging.handlers import RotatingFileHandler
 
+# 日志格式化器，模块加载时创建一次，所有处理器共用
+_LOG_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
 def setup_logger(name, level=logging.INFO, log_file=None, max_bytes=10485760, backup_count=5):
     """配置日志记录器
     
@@ -31,8 +34,7 @@ def setup_logger(name, level=logging.INFO, log_file=None, max_bytes=10485760, ba
     console_handler.setLevel(level)
     
     # 设置格式化器
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    console_handler.setFormatter(formatter)
+    console_handler.setFormatter(_LOG_FORMATTER)
     
     # 添加处理器到日志记录器
     logger.addHandler(console_handler)
@@ -52,7 +54,7 @@ def setup_logger(name, level=logging.INFO, log_file=None, max_bytes=10485760, ba
             encoding='utf-8'
         )
         file_handler.setLevel(level)
-        file_handler.setFormatter(formatter)
+        file_handler.setFormatter(_LOG_FORMATTER)
         
         # 添加到日志记录器
         logger.addHandler(file_handler)